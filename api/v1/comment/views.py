@@ -1,5 +1,4 @@
-from django.db.models import Count, Prefetch, Value
-from django.db.models.functions import Concat, Substr
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import PermissionDenied
@@ -29,11 +28,7 @@ def post_comments(request: Request, post_id):
     if request.method == "GET":
         queryset = (
             Comment.objects.filter(post=post_id, parent__isnull=True)
-            .annotate(
-                excerpt=Concat(Substr("content", 1, 80), Value("...")),
-                reply_count=Count("replies__id", distinct=True),
-                like_count=Count("likes__id", distinct=True),
-            )
+            .defer("content")
             .order_by("-like_count", "-reply_count")
         )
 
@@ -60,20 +55,13 @@ def post_comment_detail(request: Request, comment_id):
             return Response({"detail": "Comment not found"})
         replies_qs = (
             Comment.objects.filter(parent=comment_id)
-            .annotate(excerpt=(Concat(Substr("content", 1, 50), Value("..."))))
-            .order_by("-likes")[:3]
+            .defer("content")
+            .order_by("-like_count")[:3]
         )
 
-        qs = (
-            Comment.objects.prefetch_related(
-                Prefetch("replies", queryset=replies_qs, to_attr="top_replies")
-            )
-            .annotate(
-                reply_count=Count("replies", distinct=True),
-                like_count=Count("likes__id", distinct=True),
-            )
-            .get(id=comment_id)
-        )
+        qs = Comment.objects.prefetch_related(
+            Prefetch("replies", queryset=replies_qs, to_attr="top_replies")
+        ).get(id=comment_id)
 
         serializer = CommentDetailSerializer(instance=qs)
         return Response(serializer.data)
@@ -108,10 +96,7 @@ def comment_replies(request: Request, comment_id):
     if request.method == "GET":
         queryset = (
             Comment.objects.filter(parent=comment_id)
-            .annotate(
-                excerpt=Concat(Substr("content", 1, 50), Value("...")),
-                like_count=Count("likes__id", distinct=True),
-            )
+            .defer("content")
             .order_by("-like_count")
         )
 
@@ -139,9 +124,7 @@ def comment_replies(request: Request, comment_id):
 def comment_reply_details(request: Request, reply_id):
     if request.method == "GET":
         try:
-            qs_reply = Comment.objects.annotate(
-                like_count=Count("likes__id", distinct=True)
-            ).get(id=reply_id)
+            qs_reply = Comment.objects.get(id=reply_id)
         except Comment.DoesNotExist:
             return Response(
                 {"detail": "Reply not found"}, status=status.HTTP_404_NOT_FOUND
@@ -1,5 +1,3 @@
-from django.db.models import Count, Prefetch, Q, Value
-from django.db.models.functions import Concat, Substr
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -11,6 +9,7 @@ from rest_framework.response import Response
 
 from api.v1.post.serializer import PostDetailSerializer, PostListSerializer
 from app.comment.models import Comment
+from app.comment.service import attach_top_comments
 from app.core.permissions import (
     AllowAnyForGetRequireAuthForWrite,
     DraftAccessPermission,
@@ -26,13 +25,7 @@ from app.post.service import get_accessible_posts_queryset
 @permission_classes([AllowAnyForGetRequireAuthForWrite])
 def post_list(request: Request):
     if request.method == "GET":
-        qs = Post.objects.order_by("-created_at").annotate(
-            comment_count=Count(
-                "comments", filter=Q(comments__parent__isnull=True), distinct=True
-            ),
-            excerpt=Concat(Substr("content", 1, 100), Value(" ...")),
-            like_count=Count("likes", distinct=True),
-        )
+        qs = Post.objects.order_by("-created_at").defer("content")
 
         user = request.user
         query_params = request.query_params
@@ -63,33 +56,7 @@ def post_list(request: Request):
 def post_detail(request: Request, post_id):
     if request.method == "GET":
         try:
-            top_comment_qs = (
-                Comment.objects.filter(post=post_id)
-                .prefetch_related("replies")
-                .annotate(
-                    excerpt=Concat(Substr("content", 1, 100), Value(" ...")),
-                    like_count=Count("likes", distinct=True),
-                    reply_count=Count("replies", distinct=True),
-                )
-                .order_by("-likes", "-reply_count")[:3]
-            )
-
-            post = (
-                Post.objects.prefetch_related(
-                    Prefetch(
-                        "comments", queryset=top_comment_qs, to_attr="top_comments"
-                    )
-                )
-                .annotate(
-                    comment_count=Count(
-                        "comments",
-                        filter=Q(comments__parent__isnull=True),
-                        distinct=True,
-                    ),
-                    like_count=Count("likes", distinct=True),
-                )
-                .get(id=post_id)
-            )
+            post = Post.objects.get(id=post_id)
 
             if not post.is_published and not request.user.is_authenticated:
                 raise NotAuthenticated("Authentication credentials were not provided.")
@@ -103,6 +70,7 @@ def post_detail(request: Request, post_id):
                 {"detail": "Post not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        attach_top_comments([post], queryset=Comment.objects.defer("content"))
         serializer = PostDetailSerializer(instance=post)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -133,13 +101,7 @@ def post_detail(request: Request, post_id):
 def get_popular_posts(request: Request):
     qs = (
         Post.objects.filter(is_published=True)
-        .annotate(
-            excerpt=Concat(Substr("content", 1, 100), Value("...")),
-            like_count=Count("likes", distinct=True),
-            comment_count=Count(
-                "comments", filter=Q(comments__parent__isnull=True), distinct=True
-            ),
-        )
+        .defer("content")
         .order_by("-like_count", "comment_count")[:10]
     )
 
@@ -97,7 +97,7 @@ class TestCommentDetailSerializer(APITestCase):
 
         self.assertSetEqual(
             set(ser.data.keys()),
-            {"id", "author", "post", "likes", "content", "created_at"},
+            {"id", "author", "post", "likes", "reply_count", "content", "created_at"},
         )
 
     def test_serializer_creates_comment(self):
@@ -95,5 +95,14 @@ class TestPostDetailSerializer(APITestCase):
 
         self.assertSetEqual(
             set(ser.data.keys()),
-            {"id", "author", "title", "content", "is_published", "created_at"},
+            {
+                "id",
+                "author",
+                "title",
+                "content",
+                "is_published",
+                "likes",
+                "comment_count",
+                "created_at",
+            },
         )
@@ -3,10 +3,14 @@ from rest_framework import serializers
 from rest_framework.exceptions import NotAuthenticated
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from app.core.security.blacklist import FilteredRefreshToken
+
 User = get_user_model()
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = FilteredRefreshToken
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -6,9 +6,7 @@ from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.generics import CreateAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from api.v2.auth.serializer import (
@@ -16,13 +14,16 @@ from api.v2.auth.serializer import (
     RegisterSerializer,
     UserSerializer,
 )
+from app.core.instrumentation import APIViewMixin, GenericViewMixin
 from app.core.permissions import IsAuthenticated
+from app.core.security.authentication import CachedJWTAuthentication
+from app.core.security.blacklist import FilteredRefreshToken
 from app.core.security.throttling.auth import LoginThrottle, RegisterThrottle
 
 logger = logging.getLogger(__name__)
 
 
-class CustomTokenObtainPairView(TokenObtainPairView):
+class CustomTokenObtainPairView(GenericViewMixin, TokenObtainPairView):
     throttle_classes = [LoginThrottle]
     serializer_class = CustomTokenObtainPairSerializer
 
@@ -43,7 +44,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         return response
 
 
-class CreateUserAPIView(CreateAPIView):
+class CreateUserAPIView(GenericViewMixin, CreateAPIView):
     throttle_classes = [RegisterThrottle]
     serializer_class = RegisterSerializer
 
@@ -56,8 +57,8 @@ class CreateUserAPIView(CreateAPIView):
         )
 
 
-class LogoutAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class LogoutAPIView(APIViewMixin, APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -65,7 +66,7 @@ class LogoutAPIView(APIView):
         if not refresh_token:
             raise ValidationError("Refresh token is required")
         try:
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
         except TokenError as err:
             raise ValidationError("Invalid refresh token") from err
@@ -76,7 +77,7 @@ class LogoutAPIView(APIView):
         return response
 
 
-class TokenRefreshView(APIView):
+class TokenRefreshView(APIViewMixin, APIView):
     authentication_classes = []
     permission_classes = []
 
@@ -87,7 +88,7 @@ class TokenRefreshView(APIView):
             raise ValidationError("Refresh token is required")
 
         try:
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             response = Response(
                 {"access_token": str(token.access_token), "refresh_token": str(token)}
             )
@@ -105,7 +106,7 @@ class TokenRefreshView(APIView):
             raise AuthenticationFailed("Invalid or expired token")
 
 
-class MeView(APIView):
+class MeView(APIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -5,6 +5,7 @@ from django.utils.text import Truncator
 from rest_framework import serializers
 
 from app.comment.models import Comment
+from app.core.serializers import CompiledListSerializer
 
 User = get_user_model()
 
@@ -16,7 +17,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class CommentListSerializer(serializers.ModelSerializer):
-    excerpt = serializers.SerializerMethodField()
+    excerpt = serializers.CharField(read_only=True)
     reply_count = serializers.IntegerField(read_only=True)
     likes = serializers.IntegerField(read_only=True, source="like_count")
     author = UserSerializer(read_only=True)
@@ -35,12 +36,7 @@ class CommentListSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = fields
-
-    def get_excerpt(self, obj):
-        words = obj.content.split()
-        if len(words) <= 30:
-            return obj.content
-        return Truncator(obj.content).words(30, truncate=" ...")
+        list_serializer_class = CompiledListSerializer
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -71,12 +67,15 @@ class ReplyListSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ["id", "author", "excerpt", "likes", "created_at"]
         read_only_fields = fields
+        extra_projection = ["excerpt"]  # read by get_excerpt
+        list_serializer_class = CompiledListSerializer
 
     def get_excerpt(self, obj):
-        words = obj.content.split()
+        # derived from the stored 30-word excerpt, same output as on content
+        words = obj.excerpt.split()
         if len(words) <= 20:
-            return obj.content
-        return Truncator(obj.content).words(30, truncate=" ...")
+            return obj.excerpt
+        return Truncator(obj.excerpt).words(30, truncate=" ...")
 
 
 class CommentDetailSerializer(serializers.ModelSerializer):
@@ -154,3 +153,26 @@ class ReplyDetailSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ["id", "author", "content", "parent", "likes", "created_at"]
         read_only_fields = ["id", "author", "parent", "likes", "creaated_at"]
+
+
+class CommentTreeSerializer(serializers.ModelSerializer):
+    likes = serializers.IntegerField(read_only=True, source="like_count")
+    reply_count = serializers.IntegerField(read_only=True)
+    author = UserSerializer(read_only=True)
+    liked = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = [
+            "id",
+            "author",
+            "parent",
+            "depth",
+            "content",
+            "reply_count",
+            "likes",
+            "liked",
+            "created_at",
+        ]
+        read_only_fields = fields
+        list_serializer_class = CompiledListSerializer
@@ -0,0 +1,141 @@
+import uuid
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import force_authenticate
+
+from api.v2.comment.views import CommentTreeAPIView
+from app.comment.models import Comment
+from app.comment.threads import MAX_DEPTH
+
+
+def _get_tree(api_rf, post_id, user=None, **params):
+    url = reverse("v2:comment-tree", args=[post_id])
+    request = api_rf.get(path=url, data=params)
+    if user:
+        force_authenticate(request=request, user=user)
+    return CommentTreeAPIView.as_view()(request, post_id=post_id)
+
+
+def test_reply_path_extends_parent_path(comments):
+    comment, reply = comments["comment_1"], comments["reply_1"]
+
+    assert comment.depth == 0
+    assert reply.depth == 1
+    assert reply.path.startswith(comment.path)
+    assert len(reply.path) == 2 * len(comment.path)
+
+
+def test_threads_nest_down_to_max_depth(users, posts, comments):
+    reply = comments["reply_1"]
+    while reply.depth < MAX_DEPTH:
+        reply = Comment.objects.create(
+            content="deeper", post=posts["post_1"], parent=reply, author=users["user_1"]
+        )
+
+    with pytest.raises(ValidationError) as error:
+        Comment.objects.create(
+            content="too deep",
+            post=posts["post_1"],
+            parent=reply,
+            author=users["user_1"],
+        )
+
+    assert "parent" in error.value.message_dict
+
+
+def test_tree_returns_nested_thread_in_creation_order(posts, comments, api_rf):
+    response = _get_tree(api_rf, posts["post_1"].id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [node["id"] for node in response.data] == [
+        str(comments[name].id)
+        for name in ("comment_1", "comment_2", "comment_3", "comment_4")
+    ]
+
+    first = response.data[0]
+    assert first["reply_count"] == 2
+    assert [child["id"] for child in first["children"]] == [
+        str(comments["reply_1"].id),
+        str(comments["reply_2"].id),
+    ]
+    assert all(child["depth"] == 1 for child in first["children"])
+    assert first["children"][0]["children"] == []
+
+
+def test_tree_runs_a_fixed_number_of_queries(
+    users, posts, comments, api_rf, django_assert_num_queries
+):
+    for i in range(5):
+        Comment.objects.create(
+            content=f"nested reply {i}",
+            post=posts["post_1"],
+            parent=comments["reply_1"],
+            author=users["user_1"],
+        )
+
+    ContentType.objects.get_for_model(Comment)  # warm the content type cache
+
+    # post exists + comments + liked
+    with django_assert_num_queries(3):
+        response = _get_tree(api_rf, posts["post_1"].id, user=users["user_2"])
+
+    grandchildren = response.data[0]["children"][0]["children"]
+    assert len(grandchildren) == 5
+    assert all(node["depth"] == 2 for node in grandchildren)
+
+
+def test_tree_with_root_returns_only_that_subtree(posts, comments, api_rf):
+    response = _get_tree(api_rf, posts["post_1"].id, root=comments["comment_1"].id)
+
+    assert len(response.data) == 1
+    assert response.data[0]["id"] == str(comments["comment_1"].id)
+    assert len(response.data[0]["children"]) == 2
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="SQLite always compares bytewise"
+)
+def test_paths_compare_bytewise_on_postgres(db):
+    # under a locale collation "~" sorts before the hex digits and subtree
+    # ranges come back empty (test_tree_with_root_returns_only_that_subtree)
+    table = Comment._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT collation_name FROM information_schema.columns "
+            "WHERE table_name = %s AND column_name = 'path'",
+            [table],
+        )
+        assert cursor.fetchone()[0] == "C"
+
+
+def test_tree_depth_limits_levels_below_root(posts, comments, api_rf):
+    response = _get_tree(api_rf, posts["post_1"].id, depth=0)
+
+    assert len(response.data) == 4
+    assert all(node["children"] == [] for node in response.data)
+
+
+def test_tree_with_invalid_depth_returns_400(posts, api_rf):
+    response = _get_tree(api_rf, posts["post_1"].id, depth="deep")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_tree_with_root_of_another_post_returns_404(posts, comments, api_rf):
+    for root in (comments["comment_5"].id, "not-a-uuid"):
+        response = _get_tree(api_rf, posts["post_1"].id, root=root)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data["detail"] == "Comment not found."
+
+
+def test_tree_with_invalid_post_id_returns_404(posts, api_rf):
+    response = _get_tree(api_rf, uuid.uuid4())
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.data["detail"] == "Post not found."
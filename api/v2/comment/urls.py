@@ -3,6 +3,7 @@ from django.urls import path
 from api.v2.comment.views import (
     CommentListCreateAPIView,
     CommentRetrieveUpdateDestroyAPIView,
+    CommentTreeAPIView,
     ReplyListCreateAPIView,
     ReplyRetrieveUpdateDestroyAPIView,
 )
@@ -13,6 +14,11 @@ urlpatterns = [
         CommentListCreateAPIView.as_view(),
         name="comments",
     ),
+    path(
+        "posts/<uuid:post_id>/comments/tree/",
+        CommentTreeAPIView.as_view(),
+        name="comment-tree",
+    ),
     path(
         "comments/<uuid:comment_id>/",
         CommentRetrieveUpdateDestroyAPIView.as_view(),
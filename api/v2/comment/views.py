@@ -1,35 +1,50 @@
 import logging
-
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import BooleanField, Count, Exists, OuterRef, Prefetch, Value
-from rest_framework.exceptions import NotFound
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.pagination import PageNumberPagination
+import uuid
+from functools import partial
+
+from django.db.models import Prefetch
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import (
+    ListAPIView,
+    ListCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+)
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
 from api.v2.comment.serializer import (
     CommentCreateSerializer,
     CommentDetailSerializer,
     CommentListSerializer,
+    CommentTreeSerializer,
     ReplyCreateSerializer,
     ReplyDetailSerializer,
     ReplyListSerializer,
 )
 from app.comment.models import Comment
+from app.comment.threads import nest, subtree_range
+from app.core.async_views import AsyncListMixin
+from app.core.instrumentation import GenericViewMixin
+from app.core.pagination import PageOrCursorPagination
+from app.core.projection import ProjectedListMixin
 from app.core.permissions import IsAdminOrSelf, IsAuthenticated, IsOwner
-from app.like.models import Like
+from app.like.services import aattach_liked, attach_liked
+from app.post.cache import cached_response, post_version_key
 from app.post.models import Post
 
 logger = logging.getLogger(__name__)
 
 
-class CommentListCreateAPIView(ListCreateAPIView):
+class CommentListCreateAPIView(
+    GenericViewMixin, AsyncListMixin, ProjectedListMixin, ListCreateAPIView
+):
     """
     GET -> List: comments (with pagination)
     POST -> Create: comment
     """
 
-    pagination_class = PageNumberPagination
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ("-like_count", "-reply_count", "-created_at", "id")
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -39,31 +54,30 @@ class CommentListCreateAPIView(ListCreateAPIView):
     def get_queryset(self):
         if not Post.objects.filter(id=self.kwargs["post_id"]).exists():
             raise NotFound("Post not found.")
+        return self._comments()
 
-        annotations = {
-            "like_count": Count("likes", distinct=True),
-            "reply_count": Count("replies", distinct=True),
-        }
-
-        if self.request.user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Comment)
-            annotations["liked"] = Exists(
-                Like.objects.filter(
-                    user=self.request.user,
-                    object_id=OuterRef("id"),
-                    content_type=content_type,
-                )
-            )
-        else:
-            annotations["liked"] = Value(False, output_field=BooleanField())
+    async def aget_queryset(self):
+        if not await Post.objects.filter(id=self.kwargs["post_id"]).aexists():
+            raise NotFound("Post not found.")
+        return self._comments()
 
+    def _comments(self):
         return (
             Comment.objects.filter(post_id=self.kwargs["post_id"], parent__isnull=True)
             .select_related("author")
-            .annotate(**annotations)
             .order_by("-like_count", "-reply_count", "-created_at")
         )
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        return attach_liked(self.request.user, page) if page is not None else None
+
+    async def apaginate_queryset(self, queryset):
+        page = await super().apaginate_queryset(queryset)
+        if page is None:
+            return None
+        return await aattach_liked(self.request.user, page)
+
     def get_serializer_class(self):
         return (
             CommentListSerializer
@@ -89,7 +103,77 @@ class CommentListCreateAPIView(ListCreateAPIView):
         )
 
 
-class CommentRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class CommentTreeAPIView(GenericViewMixin, ProjectedListMixin, ListAPIView):
+    """
+    GET -> List: a post's whole comment thread (or the subtree under ?root=)
+    as nested nodes, fetched in a single query ordered by materialized path
+    """
+
+    serializer_class = CommentTreeSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        post_id = self.kwargs["post_id"]
+        if not Post.objects.filter(id=post_id).exists():
+            raise NotFound("Post not found.")
+
+        queryset = Comment.objects.filter(post_id=post_id)
+        max_depth = self._max_depth()
+
+        root_id = self.request.query_params.get("root")
+        if root_id:
+            root = self._root(post_id, root_id)
+            queryset = queryset.filter(**subtree_range(root["path"]))
+            if max_depth is not None:
+                max_depth += root["depth"]
+
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=max_depth)
+
+        return queryset.select_related("author").order_by("path")
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            "comments:tree",
+            [post_version_key(self.kwargs["post_id"])],
+            partial(self._build, request),
+        )
+
+    def _build(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        comments = attach_liked(request.user, queryset)
+        serializer = self.get_serializer(comments, many=True)
+        return Response(nest(serializer.data))
+
+    def _root(self, post_id, root_id):
+        try:
+            root_id = uuid.UUID(root_id)
+        except ValueError as err:
+            raise NotFound("Comment not found.") from err
+
+        root = (
+            Comment.objects.filter(post_id=post_id, id=root_id)
+            .values("path", "depth")
+            .first()
+        )
+        if not root:
+            raise NotFound("Comment not found.")
+        return root
+
+    def _max_depth(self):
+        depth = self.request.query_params.get("depth")
+        if depth is None:
+            return None
+        if not depth.isdigit():
+            raise ValidationError({"depth": "depth must be a non-negative integer"})
+        return int(depth)
+
+
+class CommentRetrieveUpdateDestroyAPIView(
+    GenericViewMixin, RetrieveUpdateDestroyAPIView
+):
     """
     GET -> retrieve: comment
     PATCH -> partial update: comment
@@ -114,19 +198,13 @@ class CommentRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
             raise NotFound("Comment not found.")
         replies_qs = (
             Comment.objects.filter(parent=comment)
-            .annotate(like_count=Count("likes", distinct=True))
-            .order_by("-likes", "-created_at")[:3]
-        )
-        return (
-            Comment.objects.prefetch_related(
-                Prefetch("replies", queryset=replies_qs, to_attr="top_replies")
-            )
-            .annotate(
-                reply_count=Count("replies", distinct=True),
-                like_count=Count("likes", distinct=True),
-            )
-            .filter(id=self.kwargs["comment_id"])
+            .select_related("author")
+            .defer("content")
+            .order_by("-like_count", "-created_at")[:3]
         )
+        return Comment.objects.prefetch_related(
+            Prefetch("replies", queryset=replies_qs, to_attr="top_replies")
+        ).filter(id=self.kwargs["comment_id"])
 
     def perform_update(self, serializer):
         instance = serializer.save()
@@ -151,13 +229,16 @@ class CommentRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         super().perform_destroy(instance)
 
 
-class ReplyListCreateAPIView(ListCreateAPIView):
+class ReplyListCreateAPIView(
+    GenericViewMixin, AsyncListMixin, ProjectedListMixin, ListCreateAPIView
+):
     """
     GET -> List: replies (with pagination)
     POST -> Create: reply
     """
 
-    pagination_class = PageNumberPagination
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ("-like_count", "-created_at", "id")
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -172,13 +253,27 @@ class ReplyListCreateAPIView(ListCreateAPIView):
         )
 
     def get_queryset(self):
-        comment = Comment.objects.filter(id=self.kwargs["comment_id"]).first()
-        if not comment:
+        comment_id = self._comment_ids().first()
+        if not comment_id:
             raise NotFound("Comment not found.")
+        return self._replies(comment_id)
+
+    async def aget_queryset(self):
+        comment_id = await self._comment_ids().afirst()
+        if not comment_id:
+            raise NotFound("Comment not found.")
+        return self._replies(comment_id)
+
+    def _comment_ids(self):
+        # only the pk: the parent row itself is not serialized
+        return Comment.objects.filter(id=self.kwargs["comment_id"]).values_list(
+            "id", flat=True
+        )
+
+    def _replies(self, comment_id):
         return (
-            Comment.objects.filter(parent=comment)
+            Comment.objects.filter(parent_id=comment_id)
             .select_related("author")
-            .annotate(like_count=Count("likes", distinct=True))
             .order_by("-like_count", "-created_at")
         )
 
@@ -193,7 +288,7 @@ class ReplyListCreateAPIView(ListCreateAPIView):
         )
 
 
-class ReplyRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class ReplyRetrieveUpdateDestroyAPIView(GenericViewMixin, RetrieveUpdateDestroyAPIView):
     """
     GET -> retrieve: reply
     PATCH -> update: reply
@@ -212,8 +307,6 @@ class ReplyRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         return [IsAuthenticated(), IsOwner()]
 
     def get_queryset(self):
-        return (
-            Comment.objects.annotate(like_count=Count("likes", distinct=True))
-            .prefetch_related("author")
-            .filter(id=self.kwargs["reply_id"])
+        return Comment.objects.select_related("author").filter(
+            id=self.kwargs["reply_id"]
         )
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import force_authenticate
+
+from api.v2.like.views import LikeCommentAPIView, LikePostAPIView
+from app.comment.models import Comment
+from app.post.models import Post
+
+
+def test_fixture_counters_match_rows(posts, comments, likes):
+    post = Post.objects.get(id=posts["post_1"].id)
+    comment = Comment.objects.get(id=comments["comment_1"].id)
+
+    assert post.like_count == 1
+    assert post.comment_count == 4  # replies are not top-level comments
+    assert comment.reply_count == 2
+    assert Comment.objects.get(id=comments["comment_5"].id).like_count == 1
+
+
+def test_like_and_unlike_post_keep_like_count_exact(users, posts, likes, api_rf):
+    post = posts["post_1"]
+    url = reverse("v2:like-post", args=[post.id])
+    view = LikePostAPIView.as_view()
+
+    for _ in range(2):  # liking twice must not double count
+        request = api_rf.post(path=url)
+        force_authenticate(request=request, user=users["user_1"])
+        response = view(request, post_id=post.id)
+        assert response.data["like_count"] == 2
+
+    request = api_rf.delete(path=url)
+    force_authenticate(request=request, user=users["user_1"])
+    response = view(request, post_id=post.id)
+
+    assert response.data["like_count"] == 1
+    assert Post.objects.get(id=post.id).like_count == 1
+
+
+def test_like_comment_updates_like_count(users, comments, api_rf):
+    comment = comments["comment_2"]
+    url = reverse("v2:like-comment", args=[comment.id])
+    request = api_rf.post(path=url)
+    force_authenticate(request=request, user=users["user_3"])
+
+    response = LikeCommentAPIView.as_view()(request, comment_id=comment.id)
+
+    assert response.data["like_count"] == 1
+    assert Comment.objects.get(id=comment.id).like_count == 1
+
+
+def test_deleting_reply_decrements_reply_count(comments):
+    comments["reply_1"].delete()
+
+    assert Comment.objects.get(id=comments["comment_1"].id).reply_count == 1
+
+
+def test_deleting_comment_cascades_without_touching_other_counters(
+    posts, comments, likes
+):
+    comments["comment_5"].delete()
+
+    post = Post.objects.get(id=posts["post_2"].id)
+    assert post.comment_count == 0
+    assert not Comment.objects.filter(id=comments["reply_3"].id).exists()
+
+
+def test_deleting_user_decrements_counters_on_other_authors_content(
+    users, posts, comments, likes
+):
+    users["user_3"].delete()
+
+    assert Post.objects.get(id=posts["post_1"].id).like_count == 0
+    assert Comment.objects.get(id=comments["comment_1"].id).reply_count == 1
+
+
+def test_saving_stale_instance_does_not_overwrite_counters(posts, likes):
+    stale = Post.objects.get(id=posts["post_1"].id)
+    Post.objects.filter(id=stale.id).update(like_count=7)
+
+    stale.title = "Updated title"
+    stale.save()
+
+    assert Post.objects.get(id=stale.id).like_count == 7
+
+
+def test_rebuild_counters_repairs_drift(posts, comments, likes):
+    Post.objects.filter(id=posts["post_1"].id).update(like_count=42, comment_count=0)
+    Comment.objects.filter(id=comments["comment_1"].id).update(reply_count=9)
+
+    out = StringIO()
+    call_command("rebuild_counters", "--dry-run", stdout=out)
+    assert "1 posts with drifted counters" in out.getvalue()
+    assert Post.objects.get(id=posts["post_1"].id).like_count == 42
+
+    call_command("rebuild_counters", stdout=StringIO())
+
+    post = Post.objects.get(id=posts["post_1"].id)
+    assert (post.like_count, post.comment_count) == (1, 4)
+    assert Comment.objects.get(id=comments["comment_1"].id).reply_count == 2
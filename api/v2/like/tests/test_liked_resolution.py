@@ -0,0 +1,52 @@
+from django.urls import reverse
+from rest_framework.test import force_authenticate
+
+from api.v2.comment.views import CommentListCreateAPIView
+from api.v2.post.views import PostListCreateAPIView
+
+
+def _liked_by_id(response):
+    return {item["id"]: item["liked"] for item in response.data["results"]}
+
+
+def test_post_list_marks_liked_posts_for_user(users, posts, likes, api_rf):
+    request = api_rf.get(reverse("v2:posts"))
+    force_authenticate(request=request, user=users["user_3"])
+
+    response = PostListCreateAPIView.as_view()(request)
+
+    liked = _liked_by_id(response)
+    assert liked.pop(str(posts["post_1"].id)) is True
+    assert not any(liked.values())
+
+
+def test_post_list_resolves_liked_with_one_query_and_no_subquery(
+    users, posts, likes, api_rf, django_assert_num_queries
+):
+    request = api_rf.get(reverse("v2:posts"))
+    force_authenticate(request=request, user=users["user_3"])
+
+    # count + page + liked IN lookup
+    with django_assert_num_queries(3) as ctx:
+        PostListCreateAPIView.as_view()(request)
+
+    assert not any("EXISTS" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_comment_list_marks_liked_comments_for_user(
+    users, posts, comments, likes, api_rf
+):
+    post = posts["post_2"]
+    request = api_rf.get(reverse("v2:comments", args=[post.id]))
+    force_authenticate(request=request, user=users["user_2"])
+
+    response = CommentListCreateAPIView.as_view()(request, post_id=post.id)
+
+    assert _liked_by_id(response) == {str(comments["comment_5"].id): True}
+
+
+def test_anonymous_lists_are_never_liked(posts, likes, api_rf):
+    response = PostListCreateAPIView.as_view()(api_rf.get(reverse("v2:posts")))
+
+    assert response.data["results"]
+    assert not any(_liked_by_id(response).values())
@@ -0,0 +1,163 @@
+from io import StringIO
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import force_authenticate
+
+from api.v2.like.views import LikeCommentAPIView, LikePostAPIView
+from app.comment.models import Comment
+from app.like.models import Like, LikeCountDelta
+from app.like.services.counters import (
+    buffered_like_count,
+    flush_like_deltas,
+    pending_key,
+)
+from app.post.models import Post
+
+
+@pytest.fixture
+def write_behind(transactional_db, settings, likes):
+    # the fixture likes are counted synchronously before the switch; the
+    # pending sums are cached once the journaling transaction commits
+    settings.LIKE_COUNT_WRITE_BEHIND = True
+
+
+def _like(view, api_rf, url, user, method="post", **kwargs):
+    request = getattr(api_rf, method)(path=url)
+    force_authenticate(request=request, user=user)
+    return view.as_view()(request, **kwargs)
+
+
+def test_like_is_journaled_and_response_includes_pending_delta(
+    write_behind, users, posts, likes, api_rf
+):
+    post = posts["post_1"]
+    url = reverse("v2:like-post", args=[post.id])
+
+    response = _like(LikePostAPIView, api_rf, url, users["user_2"], post_id=post.id)
+
+    assert response.data["like_count"] == 2
+    assert Post.objects.get(id=post.id).like_count == 1
+    assert LikeCountDelta.objects.count() == 1
+
+
+def test_repeated_like_adds_no_delta(write_behind, users, posts, api_rf):
+    post = posts["post_2"]
+    url = reverse("v2:like-post", args=[post.id])
+
+    for _ in range(3):
+        response = _like(LikePostAPIView, api_rf, url, users["user_1"], post_id=post.id)
+
+    assert response.data["like_count"] == 1
+    assert LikeCountDelta.objects.count() == 1
+
+
+def test_flush_applies_deltas_once_and_clears_journal(
+    write_behind, users, posts, comments, likes, api_rf
+):
+    post, comment = posts["post_1"], comments["comment_2"]
+    post_url = reverse("v2:like-post", args=[post.id])
+    comment_url = reverse("v2:like-comment", args=[comment.id])
+
+    for user in ("user_1", "user_2"):
+        _like(LikePostAPIView, api_rf, post_url, users[user], post_id=post.id)
+        _like(
+            LikeCommentAPIView,
+            api_rf,
+            comment_url,
+            users[user],
+            comment_id=comment.id,
+        )
+    _like(
+        LikePostAPIView,
+        api_rf,
+        post_url,
+        users["user_2"],
+        method="delete",
+        post_id=post.id,
+    )
+
+    assert flush_like_deltas() == 5
+    assert flush_like_deltas() == 0  # nothing left to apply twice
+    assert LikeCountDelta.objects.count() == 0
+    assert Post.objects.get(id=post.id).like_count == 2
+    assert Comment.objects.get(id=comment.id).like_count == 2
+
+
+def test_flush_in_batches_matches_synchronous_counts(
+    write_behind, users, posts, likes, api_rf
+):
+    post = posts["post_1"]
+    url = reverse("v2:like-post", args=[post.id])
+    for user in ("user_1", "user_2", "admin"):
+        _like(LikePostAPIView, api_rf, url, users[user], post_id=post.id)
+
+    out = StringIO()
+    call_command("flush_like_counts", batch_size=2, stdout=out)
+
+    assert "Flushed 3 like deltas" in out.getvalue()
+    assert Post.objects.get(id=post.id).like_count == 4
+    assert not LikeCountDelta.objects.exists()
+
+
+def test_flush_refreshes_popular_ranking(write_behind, users, posts, api_rf):
+    post = posts["post_3"]
+    url = reverse("v2:like-post", args=[post.id])
+    before = Post.objects.get(id=post.id).ranking.score
+
+    _like(LikePostAPIView, api_rf, url, users["user_1"], post_id=post.id)
+    flush_like_deltas()
+
+    assert Post.objects.get(id=post.id).ranking.score > before
+
+
+def test_rebuild_counters_leaves_no_delta_to_apply_twice(
+    write_behind, users, posts, api_rf
+):
+    post = posts["post_1"]
+    url = reverse("v2:like-post", args=[post.id])
+    _like(LikePostAPIView, api_rf, url, users["user_2"], post_id=post.id)
+
+    call_command("rebuild_counters", stdout=StringIO())
+    flush_like_deltas()
+
+    assert Post.objects.get(id=post.id).like_count == 2
+    assert not LikeCountDelta.objects.exists()
+
+
+def test_buffered_count_does_not_query_the_journal(
+    write_behind, users, posts, likes, django_assert_num_queries
+):
+    post = Post.objects.get(id=posts["post_1"].id)
+    Like.objects.create(
+        user=users["user_2"],
+        content_type=ContentType.objects.get_for_model(Post),
+        object_id=post.id,
+    )
+
+    with django_assert_num_queries(0):
+        assert buffered_like_count(post) == 2
+
+    flush_like_deltas()
+    post.refresh_from_db()
+    assert buffered_like_count(post) == 2
+
+
+def test_evicted_pending_sum_is_recomputed_by_the_flush(
+    write_behind, users, posts, api_rf
+):
+    post = posts["post_1"]
+    url = reverse("v2:like-post", args=[post.id])
+    _like(LikePostAPIView, api_rf, url, users["user_2"], post_id=post.id)
+    key = pending_key(ContentType.objects.get_for_model(Post).id, post.id)
+    cache.delete(key)  # evicted before the flush
+    _like(LikePostAPIView, api_rf, url, users["admin"], post_id=post.id)
+
+    flush_like_deltas()
+
+    assert cache.get(key) is None  # nothing pending, not -1
+    post = Post.objects.get(id=post.id)
+    assert buffered_like_count(post) == post.like_count == 3
@@ -5,12 +5,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from app.comment.models import Comment
+from app.core.instrumentation import APIViewMixin
 from app.core.permissions import IsAuthenticated
 from app.like.models import Like
+from app.like.services.counters import buffered_like_count
 from app.post.models import Post
 
 
-class LikePostAPIView(APIView):
+class LikePostAPIView(APIViewMixin, APIView):
     """
     POST -> create: like a post
     DELETE -> like: delete a liked post
@@ -30,7 +32,7 @@ class LikePostAPIView(APIView):
             user=request.user, object_id=post_id, content_type=content_type
         )
         return Response(
-            {"liked": created, "like_count": post.likes.count()},
+            {"liked": created, "like_count": buffered_like_count(post)},
             status=status.HTTP_200_OK,
         )
 
@@ -47,12 +49,12 @@ class LikePostAPIView(APIView):
         ).delete()
 
         return Response(
-            {"liked": deleted_count > 0, "like_count": post.likes.count()},
+            {"liked": deleted_count > 0, "like_count": buffered_like_count(post)},
             status=status.HTTP_200_OK,
         )
 
 
-class LikeCommentAPIView(APIView):
+class LikeCommentAPIView(APIViewMixin, APIView):
     """
     POST -> like: comments
     DELETE -> like: delete a liked comments
@@ -62,7 +64,7 @@ class LikeCommentAPIView(APIView):
 
     def post(self, request, comment_id):
         try:
-            post = Comment.objects.get(id=comment_id)
+            comment = Comment.objects.get(id=comment_id)
         except Comment.DoesNotExist as err:
             raise NotFound("Comment not found.") from err
 
@@ -72,7 +74,7 @@ class LikeCommentAPIView(APIView):
             user=request.user, object_id=comment_id, content_type=content_type
         )
         return Response(
-            {"liked": created, "like_count": post.likes.count()},
+            {"liked": created, "like_count": buffered_like_count(comment)},
             status=status.HTTP_200_OK,
         )
 
@@ -89,6 +91,6 @@ class LikeCommentAPIView(APIView):
         ).delete()
 
         return Response(
-            {"liked": deleted_count > 0, "like_count": comment.likes.count()},
+            {"liked": deleted_count > 0, "like_count": buffered_like_count(comment)},
             status=status.HTTP_200_OK,
         )
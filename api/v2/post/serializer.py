@@ -1,11 +1,12 @@
 from typing import Dict
 
 from django.contrib.auth import get_user_model
-from django.utils.text import Truncator
 from rest_framework import serializers
 
 from app.comment.models import Comment
+from app.core.serializers import CompiledListSerializer
 from app.post.models import Post
+from app.utils.text import make_excerpt
 
 User = get_user_model()
 
@@ -19,17 +20,11 @@ class UserSerializer(serializers.ModelSerializer):
 class PostListSerializer(serializers.ModelSerializer):
     comment_count = serializers.IntegerField(read_only=True)
     likes = serializers.IntegerField(read_only=True, source="like_count")
-    excerpt = serializers.SerializerMethodField()
+    excerpt = serializers.CharField(read_only=True)
     liked = serializers.BooleanField(read_only=True)
 
     author = UserSerializer(read_only=True)
 
-    def get_excerpt(self, obj):
-        words = obj.content.split()
-        if len(words) <= 30:
-            return obj.content
-        return Truncator(obj.content).words(30, truncate=" ...")
-
     class Meta:
         model = Post
         fields = [
@@ -44,6 +39,7 @@ class PostListSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = fields
+        list_serializer_class = CompiledListSerializer
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
@@ -91,17 +87,15 @@ class TopCommentListSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
 
     def get_excerpt(self, obj):
-        if not obj.content:
-            return ""
-        word = obj.content.split()
-        if len(word) <= 10:
-            return obj.content
-        return Truncator(obj.content).words(10, truncate=" ...")
+        # the stored 30-word excerpt cut down to 10 words
+        return make_excerpt(obj.excerpt, words=10)
 
     class Meta:
         model = Comment
         fields = ["id", "author", "excerpt", "likes", "reply_count", "created_at"]
         read_only_fields = fields
+        extra_projection = ["excerpt"]  # read by get_excerpt
+        list_serializer_class = CompiledListSerializer
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
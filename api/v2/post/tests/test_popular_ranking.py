@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from api.v2.post.views import PopularPostListAPIView
+from app.like.models import Like
+from app.post.models import Post, PostRanking
+from app.post.ranking import hot_score
+
+
+def _like(user, post):
+    Like.objects.create(
+        user=user,
+        content_type=ContentType.objects.get_for_model(Post),
+        object_id=post.id,
+    )
+
+
+def _popular_ids(api_rf):
+    response = PopularPostListAPIView.as_view()(api_rf.get(reverse("v2:popular")))
+    return [item["id"] for item in response.data["results"]]
+
+
+def test_hot_score_decays_with_age():
+    now = timezone.now()
+
+    fresh = hot_score(10, 0, now, now)
+    old = hot_score(10, 0, now - timedelta(days=2), now)
+
+    assert fresh > old > 0
+    assert hot_score(0, 0, now, now) == 0
+
+
+def test_drafts_are_never_ranked(posts):
+    ranked = set(PostRanking.objects.values_list("post_id", flat=True))
+
+    assert posts["draft_1"].id not in ranked
+    assert posts["post_1"].id in ranked
+
+
+def test_likes_and_comments_update_the_ranking_incrementally(users, posts, api_rf):
+    _like(users["user_2"], posts["post_3"])
+    _like(users["user_3"], posts["post_3"])
+    _like(users["user_2"], posts["post_2"])
+
+    ids = _popular_ids(api_rf)
+
+    assert ids[:2] == [str(posts["post_3"].id), str(posts["post_2"].id)]
+
+
+def test_unpublishing_removes_the_post_from_the_ranking(users, posts, api_rf):
+    _like(users["user_2"], posts["post_1"])
+    post = Post.objects.get(id=posts["post_1"].id)
+
+    post.is_published = False
+    post.save()
+
+    assert str(post.id) not in _popular_ids(api_rf)
+
+
+def test_rebuild_applies_time_decay_and_keeps_top_n(users, posts, api_rf):
+    for user in ("user_2", "user_3"):
+        _like(users[user], posts["post_1"])
+        _like(users[user], posts["post_2"])
+    Post.objects.filter(id=posts["post_1"].id).update(
+        created_at=timezone.now() - timedelta(days=3)
+    )
+
+    call_command("rebuild_popular_posts", "--keep", "2", stdout=StringIO())
+
+    assert PostRanking.objects.count() == 2
+    assert _popular_ids(api_rf) == [str(posts["post_2"].id), str(posts["post_1"].id)]
+
+
+def test_incremental_updates_keep_only_the_top_n(settings, users, posts):
+    settings.POPULAR_POSTS_KEEP = 2
+    call_command("rebuild_popular_posts", "--keep", "2", stdout=StringIO())
+    _like(users["user_2"], posts["post_3"])
+    _like(users["user_3"], posts["post_3"])
+
+    ranked = set(PostRanking.objects.values_list("post_id", flat=True))
+
+    assert len(ranked) == 2
+    assert posts["post_3"].id in ranked
+
+    # a post scoring below the last kept one is not added
+    post = Post.objects.create(
+        author=users["user_1"], title="new", content="unliked", is_published=True
+    )
+    assert not PostRanking.objects.filter(post_id=post.id).exists()
+    assert PostRanking.objects.count() == 2
+
+
+def test_rebuild_can_keep_nothing(posts):
+    call_command("rebuild_popular_posts", "--keep", "0", stdout=StringIO())
+
+    assert not PostRanking.objects.exists()
+
+
+def test_popular_posts_are_served_without_aggregation(
+    posts, api_rf, django_assert_num_queries
+):
+    # paginator count + one page query over the ranking index
+    with django_assert_num_queries(2) as ctx:
+        _popular_ids(api_rf)
+
+    assert all("COUNT(DISTINCT" not in q["sql"] for q in ctx.captured_queries)
@@ -0,0 +1,98 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.comment.models import Comment
+from app.like.models import Like
+from app.post.models import Post
+
+
+def test_anonymous_post_list_is_served_from_cache(posts, django_assert_num_queries):
+    client = APIClient()
+    url = reverse("v2:posts")
+    first = client.get(url)
+
+    with django_assert_num_queries(0):
+        second = client.get(url)
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data == first.data
+
+
+def test_cache_is_keyed_on_query_string(posts):
+    client = APIClient()
+    all_posts = client.get(reverse("v2:posts"))
+    by_author = client.get(reverse("v2:posts") + "?author=user2")
+
+    assert all_posts.data["count"] != by_author.data["count"]
+
+
+def test_creating_a_post_invalidates_the_list(users, posts):
+    client = APIClient()
+    url = reverse("v2:posts")
+    before = client.get(url).data["count"]
+
+    Post.objects.create(
+        title="Fresh",
+        content="Fresh content",
+        author=users["user_3"],
+        is_published=True,
+    )
+
+    assert client.get(url).data["count"] == before + 1
+
+
+def test_liking_a_post_invalidates_its_detail_and_the_list(users, posts):
+    client = APIClient()
+    post = posts["post_2"]
+    detail_url = reverse("v2:post-detail", args=[post.id])
+    assert client.get(detail_url).data["likes"] == 0
+    client.get(reverse("v2:posts"))
+
+    Like.objects.create(
+        user=users["user_1"],
+        content_type=ContentType.objects.get_for_model(Post),
+        object_id=post.id,
+    )
+
+    assert client.get(detail_url).data["likes"] == 1
+    listed = client.get(reverse("v2:posts")).data["results"]
+    assert next(p for p in listed if p["id"] == str(post.id))["likes"] == 1
+
+
+def test_comment_invalidates_only_its_post_detail(
+    users, posts, django_assert_num_queries
+):
+    client = APIClient()
+    commented = reverse("v2:post-detail", args=[posts["post_1"].id])
+    untouched = reverse("v2:post-detail", args=[posts["post_3"].id])
+    client.get(commented)
+    client.get(untouched)
+
+    Comment.objects.create(
+        content="New comment", post=posts["post_1"], author=users["user_2"]
+    )
+
+    assert client.get(commented).data["comment_count"] == 1
+    with django_assert_num_queries(0):
+        client.get(untouched)
+
+
+def test_authenticated_requests_bypass_the_cache(users, posts):
+    client = APIClient()
+    client.force_authenticate(users["user_1"])
+    url = reverse("v2:posts") + "?status=draft"
+    before = client.get(url).data["count"]
+
+    Post.objects.filter(id=posts["post_1"].id).update(is_published=False)
+
+    assert client.get(url).data["count"] == before + 1
+
+
+def test_draft_detail_is_never_cached_for_anonymous(posts):
+    client = APIClient()
+    url = reverse("v2:post-detail", args=[posts["draft_1"].id])
+
+    assert client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
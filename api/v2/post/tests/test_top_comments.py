@@ -0,0 +1,44 @@
+from django.urls import reverse
+
+from api.v2.post.views import PostRetrieveUpdateDestroyAPIView
+from app.comment.models import Comment
+from app.comment.service import attach_top_comments
+from app.post.models import Post
+
+
+def test_attach_top_comments_loads_every_post_in_one_query(
+    posts, comments, django_assert_num_queries
+):
+    Comment.objects.filter(id=comments["comment_3"].id).update(like_count=5)
+    Comment.objects.filter(id=comments["reply_1"].id).update(like_count=9)
+    page = list(Post.objects.filter(is_published=True).order_by("created_at"))
+
+    with django_assert_num_queries(1):
+        attach_top_comments(page, k=2)
+
+    top = {post.id: [comment.id for comment in post.top_comments] for post in page}
+    # likes first, then replies; replies themselves are never top comments
+    assert top[posts["post_1"].id] == [
+        comments["comment_3"].id,
+        comments["comment_1"].id,
+    ]
+    assert top[posts["post_2"].id] == [comments["comment_5"].id]
+    assert top[posts["post_3"].id] == []
+
+
+def test_attach_top_comments_with_no_posts_runs_no_query(db, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert attach_top_comments([]) == []
+
+
+def test_post_detail_returns_top_three_comments(posts, comments, api_rf):
+    post = posts["post_1"]
+    request = api_rf.get(path=reverse("v2:post-detail", args=[post.id]))
+
+    response = PostRetrieveUpdateDestroyAPIView.as_view()(request, post_id=post.id)
+
+    assert [comment["id"] for comment in response.data["top_comments"]] == [
+        str(comments["comment_1"].id),
+        str(comments["comment_4"].id),
+        str(comments["comment_3"].id),
+    ]
@@ -1,13 +1,12 @@
 import logging
+from functools import partial
 
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import BooleanField, Count, Exists, OuterRef, Prefetch, Q, Value
+from django.conf import settings
 from rest_framework.generics import (
     ListAPIView,
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
 )
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny
 
 from api.v2.post.serializer import (
@@ -15,14 +14,24 @@ from api.v2.post.serializer import (
     PostDetailSerializer,
     PostListSerializer,
 )
-from app.comment.models import Comment
+from app.comment.service import aattach_top_comments, attach_top_comments
+from app.core.async_views import AsyncListMixin, AsyncRetrieveMixin
+from app.core.instrumentation import GenericViewMixin
+from app.core.pagination import PageOrCursorPagination
+from app.core.projection import ProjectedListMixin
 from app.core.permissions import (
     DraftAccessPermission,
     IsAdminOrSelf,
     IsAuthenticated,
     IsOwner,
 )
-from app.like.models import Like
+from app.like.services import aattach_liked, attach_liked
+from app.post.cache import (
+    POST_LIST_VERSION_KEY,
+    acached_response,
+    cached_response,
+    post_version_key,
+)
 from app.post.filters import PostFilter
 from app.post.models import Post
 from app.post.service import get_accessible_posts_queryset
@@ -30,38 +39,20 @@ from app.post.service import get_accessible_posts_queryset
 logger = logging.getLogger(__name__)
 
 
-class PostListCreateAPIView(ListCreateAPIView):
+class PostListCreateAPIView(
+    GenericViewMixin, AsyncListMixin, ProjectedListMixin, ListCreateAPIView
+):
     """
     GET -> list: posts (with pagination)
     POST -> create: post
     """
 
-    pagination_class = PageNumberPagination
+    pagination_class = PageOrCursorPagination
+    cursor_ordering = ("-created_at", "id")
     filterset_class = PostFilter
 
     def get_queryset(self):
-        annotations = {
-            "like_count": Count("likes", distinct=True),
-            "comment_count": Count(
-                "comments", filter=Q(comments__parent__isnull=True), distinct=True
-            ),
-        }
-        if self.request.user.is_authenticated:
-            content_type = ContentType.objects.get_for_model(Post)
-            annotations["liked"] = Exists(
-                Like.objects.filter(
-                    user=self.request.user,
-                    content_type=content_type,
-                    object_id=OuterRef("id"),
-                )
-            )
-        else:
-            annotations["liked"] = Value(False, output_field=BooleanField())
-        base_qs = (
-            Post.objects.order_by("-created_at")
-            .select_related("author")
-            .annotate(**annotations)
-        )
+        base_qs = Post.objects.order_by("-created_at").select_related("author")
 
         user = self.request.user
         query_params = self.request.query_params
@@ -69,6 +60,32 @@ class PostListCreateAPIView(ListCreateAPIView):
 
         return base_qs
 
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            "posts:list",
+            [POST_LIST_VERSION_KEY],
+            partial(super().list, request, *args, **kwargs),
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await acached_response(
+            request,
+            "posts:list",
+            [POST_LIST_VERSION_KEY],
+            partial(super().alist, request, *args, **kwargs),
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        return attach_liked(self.request.user, page) if page is not None else None
+
+    async def apaginate_queryset(self, queryset):
+        page = await super().apaginate_queryset(queryset)
+        if page is None:
+            return None
+        return await aattach_liked(self.request.user, page)
+
     def get_permissions(self):
         if self.request.method == "GET":
             return [AllowAny(), DraftAccessPermission()]
@@ -96,7 +113,9 @@ class PostListCreateAPIView(ListCreateAPIView):
         )
 
 
-class PostRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class PostRetrieveUpdateDestroyAPIView(
+    GenericViewMixin, AsyncRetrieveMixin, RetrieveUpdateDestroyAPIView
+):
     """
     GET -> post: retrieve
     PATCH -> post: update
@@ -116,22 +135,37 @@ class PostRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         else:
             return [IsAuthenticated(), IsOwner()]
 
-    def get_queryset(self):
-        comments_qs = (
-            Comment.objects.filter(post_id=self.kwargs["post_id"])
-            .annotate(
-                like_count=Count("likes", distinct=True), reply_count=Count("replies")
-            )
-            .order_by("-like_count", "-created_at")[:3]
+    def retrieve(self, request, *args, **kwargs):
+        post_id = kwargs[self.lookup_url_kwarg]
+        return cached_response(
+            request,
+            "posts:detail",
+            [post_version_key(post_id)],
+            partial(super().retrieve, request, *args, **kwargs),
         )
 
-        return Post.objects.prefetch_related(
-            Prefetch("comments", queryset=comments_qs, to_attr="top_comments")
-        ).annotate(
-            like_count=Count("likes", distinct=True),
-            comment_count=Count("comments", distinct=True),
+    async def aretrieve(self, request, *args, **kwargs):
+        post_id = kwargs[self.lookup_url_kwarg]
+        return await acached_response(
+            request,
+            "posts:detail",
+            [post_version_key(post_id)],
+            partial(super().aretrieve, request, *args, **kwargs),
         )
 
+    def get_queryset(self):
+        return Post.objects.select_related("author")
+
+    def get_object(self):
+        post = super().get_object()
+        attach_top_comments([post])
+        return post
+
+    async def aget_object(self):
+        post = await super().aget_object()
+        await aattach_top_comments([post])
+        return post
+
     def perform_update(self, serializer):
         instance = serializer.save()
         logger.info(
@@ -164,17 +198,18 @@ class PostRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         super().perform_destroy(instance)
 
 
-class PopularPostListAPIView(ListAPIView):
+class PopularPostListAPIView(GenericViewMixin, ProjectedListMixin, ListAPIView):
     """
-    GET -> list popular posts by likes and created_at
+    GET -> list popular posts by time-decayed likes and comments
     """
 
     serializer_class = PostListSerializer
     permission_classes = [AllowAny]
 
-    queryset = Post.objects.annotate(
-        like_count=Count("likes", distinct=True),
-        comment_count=Count(
-            "comments", filter=Q(comments__parent__isnull=True), distinct=True
-        ),
-    ).order_by("-like_count", "-created_at")[:10]
+    def get_queryset(self):
+        # served straight from the materialized ranking, see app.post.ranking
+        return (
+            Post.objects.filter(ranking__isnull=False)
+            .select_related("author")
+            .order_by("-ranking__score")[: settings.POPULAR_POSTS_SIZE]
+        )
@@ -0,0 +1,180 @@
+from types import ModuleType
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import include, path, reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v2.comment.views import CommentListCreateAPIView, ReplyListCreateAPIView
+from api.v2.post.views import PostListCreateAPIView, PostRetrieveUpdateDestroyAPIView
+from app.core.middleware.budgets import QueryBudgetMiddleware
+from app.core.middleware.logging import RequestResponseLoggingMiddleware
+from app.core.middleware.monitoring.middleware import PrometheusMiddleware
+
+MIDDLEWARES = [
+    PrometheusMiddleware,
+    QueryBudgetMiddleware,
+    RequestResponseLoggingMiddleware,
+]
+
+
+def _async_urlconf():
+    # the async read views, built with ASYNC_VIEWS on, under their v2 names
+    patterns = [
+        path("posts/", PostListCreateAPIView.as_view(), name="posts"),
+        path(
+            "posts/<uuid:post_id>/",
+            PostRetrieveUpdateDestroyAPIView.as_view(),
+            name="post-detail",
+        ),
+        path(
+            "posts/<uuid:post_id>/comments/",
+            CommentListCreateAPIView.as_view(),
+            name="comments",
+        ),
+        path(
+            "comments/<uuid:comment_id>/replies/",
+            ReplyListCreateAPIView.as_view(),
+            name="replies",
+        ),
+    ]
+    urlconf = ModuleType("async_urls")
+    urlconf.urlpatterns = [path("api/v2/", include((patterns, "v2"), namespace="v2"))]
+    return urlconf
+
+
+@pytest.fixture
+def async_views(settings):
+    settings.ASYNC_VIEWS = True
+    settings.ROOT_URLCONF = _async_urlconf()
+
+
+def _get(url, **headers):
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def _urls(replies):
+    comment = replies[0].parent
+    comments = reverse("v2:comments", args=[comment.post_id])
+    return {
+        "posts": reverse("v2:posts"),
+        "posts-cursor": reverse("v2:posts") + "?cursor=",
+        "post-detail": reverse("v2:post-detail", args=[comment.post_id]),
+        "comments": comments,
+        "comments-last-page": f"{comments}?page=last",
+        "comments-invalid-page": f"{comments}?page=2",
+        "replies": reverse("v2:replies", args=[comment.id]),
+    }
+
+
+@pytest.mark.parametrize("middleware_class", MIDDLEWARES)
+def test_middlewares_run_natively_in_both_modes(middleware_class):
+    async def get_response(request):
+        pass
+
+    assert iscoroutinefunction(middleware_class(get_response))
+    assert not iscoroutinefunction(middleware_class(lambda request: None))
+
+
+def test_read_views_are_sync_unless_enabled(settings):
+    assert not iscoroutinefunction(PostListCreateAPIView.as_view())
+
+    settings.ASYNC_VIEWS = True
+    assert iscoroutinefunction(PostListCreateAPIView.as_view())
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "posts",
+        "posts-cursor",
+        "post-detail",
+        "comments",
+        "comments-last-page",
+        "comments-invalid-page",
+        "replies",
+    ],
+)
+def test_async_reads_match_the_sync_views(settings, replies, name):
+    url = _urls(replies)[name]
+    expected = APIClient().get(url)
+
+    cache.clear()
+    settings.ASYNC_VIEWS = True
+    settings.ROOT_URLCONF = _async_urlconf()
+    response = _get(url)
+
+    assert response.status_code == expected.status_code
+    assert response.json() == expected.json()
+
+
+def test_async_list_marks_the_users_likes(settings, published_posts, users):
+    post = published_posts[0]
+    token = AccessToken.for_user(users[1])
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    client.post(reverse("v2:like-post", args=[post.id]))
+
+    settings.ASYNC_VIEWS = True
+    settings.ROOT_URLCONF = _async_urlconf()
+    response = _get(reverse("v2:posts"), authorization=f"Bearer {token}")
+
+    liked = {item["id"]: item["liked"] for item in response.json()["results"]}
+    assert liked.pop(str(post.id)) is True
+    assert not any(liked.values())
+
+
+def test_async_detail_not_found(async_views, db):
+    url = reverse("v2:post-detail", args=["00000000-0000-0000-0000-000000000000"])
+
+    response = _get(url)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No Post matches the given query."
+
+
+def test_async_view_keeps_writes_sync(async_views, users):
+    token = AccessToken.for_user(users[0])
+
+    response = async_to_sync(AsyncClient().post)(
+        reverse("v2:posts"),
+        {"title": "async", "content": "posted through the async view"},
+        content_type="application/json",
+        headers={"authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["title"] == "async"
+
+
+def test_async_requests_are_metered(async_views, published_posts):
+    labels = {"method": "GET", "view": "v2:posts"}
+    queries_before = (
+        REGISTRY.get_sample_value("api_request_db_queries_sum", labels) or 0
+    )
+    count_labels = {"method": "GET", "endpoint": "api/v2/posts/", "http_status": "200"}
+    count_before = REGISTRY.get_sample_value("api_request_total", count_labels) or 0
+
+    response = _get(reverse("v2:posts"))
+
+    assert response.status_code == 200
+    assert REGISTRY.get_sample_value("api_request_total", count_labels) == (
+        count_before + 1
+    )
+    # the count and page queries ran in the request's sync thread and were
+    # still seen by the meter
+    queries = REGISTRY.get_sample_value("api_request_db_queries_sum", labels)
+    assert queries >= queries_before + 2
+
+
+def test_async_browsable_api_renders_off_the_event_loop(async_views, comments):
+    url = reverse("v2:comments", args=[comments[0].post_id])
+
+    response = _get(url, accept="text/html")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/html")
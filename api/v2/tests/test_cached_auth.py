@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.user.cache import user_cache_key
+
+
+def _client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+def test_cached_user_costs_no_queries(users):
+    client = _client(users[0])
+    first = client.get(reverse("v2:me"))
+
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get(reverse("v2:me"))
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert len(queries) == 0
+
+
+def test_disable_and_enable_take_effect_at_once(users, admin_client):
+    user = users[0]
+    client = _client(user)
+    assert client.get(reverse("v2:me")).status_code == 200
+
+    admin_client.post(reverse("v2:disable-account", args=[user.id]))
+    disabled = client.get(reverse("v2:me"))
+
+    admin_client.post(reverse("v2:enable-account", args=[user.id]))
+    enabled = client.get(reverse("v2:me"))
+
+    assert disabled.status_code == 401
+    assert enabled.status_code == 200
+
+
+def test_password_change_drops_the_cached_user(users):
+    user = users[0]
+    _client(user).get(reverse("v2:me"))
+    assert cache.get(user_cache_key(user.id)) is not None
+
+    user.set_password("a-new-password")
+    user.save()
+
+    assert cache.get(user_cache_key(user.id)) is None
+
+
+def test_cache_holds_no_password_hash(users):
+    user = users[0]
+    _client(user).get(reverse("v2:me"))
+
+    assert user.password not in cache.get(user_cache_key(user.id))
@@ -0,0 +1,104 @@
+import pytest
+from rest_framework import serializers
+
+from api.v2.comment.serializer import (
+    CommentListSerializer,
+    CommentTreeSerializer,
+    ReplyListSerializer,
+)
+from api.v2.post.serializer import PostListSerializer, TopCommentListSerializer
+from app.comment.models import Comment
+from app.core.renderers import ORJSONRenderer
+from app.core.serializers import CompiledListSerializer
+from app.like.services import attach_liked
+from app.post.models import Post
+
+LONG_TEXT = " ".join(f"word{i}" for i in range(60))
+
+
+def _render(data):
+    return ORJSONRenderer().render(data)
+
+
+def _reference(serializer_class, instances):
+    # what ListSerializer produced before: one Serializer per row
+    return [serializer_class(instance).data for instance in instances]
+
+
+@pytest.fixture
+def rows(users, published_posts, draft_posts, comments, replies):
+    Post.objects.filter(id=published_posts[0].id).update(content=LONG_TEXT)
+    Comment.objects.filter(id=comments[0].id).update(content=LONG_TEXT)
+    Comment.objects.filter(id=replies[0].id).update(content=LONG_TEXT)
+
+    posts = list(Post.objects.select_related("author").order_by("created_at"))
+    toplevel = list(
+        Comment.objects.filter(parent__isnull=True).select_related("author")
+    )
+    nested = list(Comment.objects.filter(parent__isnull=False).select_related("author"))
+    return {"posts": posts, "comments": toplevel, "replies": nested, "user": users[0]}
+
+
+def test_list_serializers_use_compiled_list_serializer():
+    for serializer_class in (
+        PostListSerializer,
+        TopCommentListSerializer,
+        CommentListSerializer,
+        ReplyListSerializer,
+        CommentTreeSerializer,
+    ):
+        assert isinstance(serializer_class(many=True), CompiledListSerializer)
+
+
+@pytest.mark.parametrize("with_liked", [True, False])
+@pytest.mark.parametrize(
+    "serializer_class, key",
+    [
+        (PostListSerializer, "posts"),
+        (TopCommentListSerializer, "comments"),
+        (CommentListSerializer, "comments"),
+        (ReplyListSerializer, "replies"),
+        (CommentTreeSerializer, "replies"),
+    ],
+)
+def test_compiled_output_is_byte_identical(rows, serializer_class, key, with_liked):
+    instances = rows[key]
+    if with_liked:
+        # without it, "liked" is skipped by both paths
+        attach_liked(rows["user"], instances)
+
+    compiled = serializer_class(instances, many=True).data
+
+    assert _render(compiled) == _render(_reference(serializer_class, instances))
+
+
+def test_compiled_output_handles_null_nested_and_missing_attributes(db):
+    class AuthorSerializer(serializers.Serializer):
+        full_name = serializers.CharField()
+
+    class RowSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        author = AuthorSerializer(allow_null=True)
+        label = serializers.CharField(source="author.full_name", default="-")
+        missing = serializers.BooleanField(read_only=True)
+        title = serializers.CharField()
+
+        class Meta:
+            list_serializer_class = CompiledListSerializer
+
+    class Row:
+        def __init__(self, id, author):
+            self.id, self.author = id, author
+
+        def title(self):
+            return f"row {self.id}"
+
+    class Author:
+        full_name = "Ada"
+
+    instances = [Row(1, Author()), Row(2, None)]
+
+    compiled = RowSerializer(instances, many=True).data
+
+    assert compiled == _reference(RowSerializer, instances)
+    assert compiled[1] == {"id": 2, "author": None, "label": "-", "title": "row 2"}
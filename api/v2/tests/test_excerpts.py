@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import Truncator
+
+from api.v2.comment.serializer import CommentListSerializer, ReplyListSerializer
+from api.v2.post.serializer import PostListSerializer, TopCommentListSerializer
+from api.v2.tests.factories.comment_factory import CommentFactory
+from api.v2.tests.factories.post_factory import PostFactory
+from app.comment.models import Comment
+from app.post.models import Post
+
+
+def _text(words, sep=" "):
+    return sep.join(f"word{i}" for i in range(words))
+
+
+def _old_excerpt(content, limit, cut=None):
+    # what the serializers computed from content before excerpts were stored
+    if len(content.split()) <= limit:
+        return content
+    return Truncator(content).words(cut or limit, truncate=" ...")
+
+
+CONTENTS = [_text(5), _text(10), _text(11), _text(25, sep="\n "), _text(80)]
+
+
+def test_save_stores_and_refreshes_excerpt(users):
+    post = PostFactory(author=users[0], content=_text(40))
+    assert post.excerpt == _text(30) + " ..."
+
+    post.content = "short now"
+    post.save(update_fields=["content"])
+
+    assert Post.objects.get(id=post.id).excerpt == "short now"
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+def test_serialized_excerpts_match_the_content_based_ones(users, content):
+    post = PostFactory(author=users[0], content=content)
+    comment = CommentFactory(author=users[0], post=post, content=content)
+
+    assert PostListSerializer(post).data["excerpt"] == _old_excerpt(content, 30)
+    assert CommentListSerializer(comment).data["excerpt"] == _old_excerpt(content, 30)
+    assert ReplyListSerializer(comment).data["excerpt"] == _old_excerpt(
+        content, 20, cut=30
+    )
+    assert TopCommentListSerializer(comment).data["excerpt"] == _old_excerpt(
+        content, 10
+    )
+
+
+def test_list_pages_do_not_select_content(api_cl, published_posts, comments):
+    post = published_posts[0]
+    urls = ["/api/v2/posts/", f"/api/v2/posts/{post.id}/comments/"]
+
+    for url in urls:
+        with CaptureQueriesContext(connection) as queries:
+            response = api_cl.get(url)
+
+        assert response.status_code == 200
+        assert all('."content"' not in query["sql"] for query in queries)
+
+
+def test_rebuild_excerpts_repairs_stale_rows(published_posts, comments):
+    Post.objects.filter(id=published_posts[0].id).update(excerpt="stale")
+    Comment.objects.update(excerpt="")
+
+    out = StringIO()
+    call_command("rebuild_excerpts", batch_size=4, stdout=out)
+
+    assert "Rebuilt excerpts on 1 posts" in out.getvalue()
+    assert "Rebuilt excerpts on 15 comments" in out.getvalue()
+    assert not Comment.objects.filter(excerpt="").exists()
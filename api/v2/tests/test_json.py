@@ -0,0 +1,74 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from app.core.parsers import ORJSONParser
+from app.core.renderers import ORJSONRenderer
+
+PAYLOAD = {
+    "id": uuid.UUID("6f1c2a4e-3b5d-4c7e-9f80-1a2b3c4d5e6f"),
+    "created_at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.UTC),
+    "day": datetime.date(2025, 1, 2),
+    "price": Decimal("12.50"),
+    "detail": ErrorDetail("Post not found.", code="not_found"),
+    "lazy": gettext_lazy("This field is required."),
+    "text": "naïve café\u2028line",
+    "items": [1, 2.5, None, True],
+}
+
+
+def test_renderer_output_matches_drf_json_renderer():
+    assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_renderer_renders_none_as_empty_body():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_renderer_indents_when_asked():
+    rendered = ORJSONRenderer().render(
+        {"a": 1}, accepted_media_type="application/json; indent=4"
+    )
+
+    assert rendered == b'{\n  "a": 1\n}'
+
+
+def test_parser_matches_drf_json_parser():
+    body = '{"title": "naïve", "tags": ["a", "b"], "n": 1.5}'.encode()
+
+    parsed = ORJSONParser().parse(io.BytesIO(body))
+
+    assert parsed == JSONParser().parse(io.BytesIO(body))
+
+
+def test_parser_decodes_non_utf8_charsets():
+    body = '{"title": "café"}'.encode("latin-1")
+
+    parsed = ORJSONParser().parse(
+        io.BytesIO(body), parser_context={"encoding": "latin-1"}
+    )
+
+    assert parsed == {"title": "café"}
+
+
+def test_parser_reports_invalid_json_as_parse_error():
+    with pytest.raises(ParseError) as excinfo:
+        ORJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    assert str(excinfo.value.detail).startswith("JSON parse error - ")
+
+
+def test_malformed_body_returns_drf_error_format(user_client):
+    response = user_client.post(
+        "/api/v2/posts/", data=b"{not json", content_type="application/json"
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("JSON parse error - ")
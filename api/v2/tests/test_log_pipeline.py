@@ -0,0 +1,181 @@
+import logging
+import os
+import queue
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from prometheus_client import REGISTRY
+
+from app.core.log_pipeline import (
+    BatchingQueueListener,
+    BatchRotatingFileHandler,
+    DroppingQueueHandler,
+)
+
+
+def _record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+class RecordingFileHandler(BatchRotatingFileHandler):
+    def handle_batch(self, records):
+        self.batches.append(len(records))
+        super().handle_batch(records)
+
+
+def test_full_queue_drops_and_counts():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    handler.set_name("test_queue")
+    labels = {"handler": "test_queue"}
+    before = REGISTRY.get_sample_value("log_records_dropped_total", labels) or 0
+
+    for i in range(5):
+        handler.handle(_record(f"record {i}"))
+
+    assert handler.queue.qsize() == 2
+    assert REGISTRY.get_sample_value("log_records_dropped_total", labels) == (
+        before + 3
+    )
+
+
+def test_listener_writes_in_batches(tmp_path):
+    target = RecordingFileHandler(tmp_path / "app.log")
+    target.batches = []
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1000))
+    handler.listener = BatchingQueueListener(handler.queue, target, batch_size=50)
+
+    # queued before the listener starts, so they are drained in full batches
+    for i in range(200):
+        handler.enqueue(handler.prepare(_record(f"record {i}")))
+    handler.handle(_record("record 200"))
+    handler.close()
+    target.close()
+
+    lines = (tmp_path / "app.log").read_text().splitlines()
+    assert lines == [f"record {i}" for i in range(201)]
+    assert target.batches[:4] == [50, 50, 50, 50]
+
+
+def test_listener_respects_handler_levels_and_rotates(tmp_path):
+    errors = BatchRotatingFileHandler(
+        tmp_path / "error.log", maxBytes=64, backupCount=2
+    )
+    errors.setLevel(logging.WARNING)
+    handler = DroppingQueueHandler(queue.Queue())
+    handler.listener = BatchingQueueListener(
+        handler.queue, errors, respect_handler_level=True, batch_size=1
+    )
+
+    for i in range(20):
+        handler.handle(_record(f"info {i}"))
+        handler.handle(_record(f"warning {i}", logging.WARNING))
+    handler.close()
+    errors.close()
+
+    written = sorted(path.name for path in tmp_path.iterdir())
+    assert "error.log.1" in written
+    contents = "".join(path.read_text() for path in tmp_path.iterdir())
+    assert "warning 19" in contents
+    assert "info" not in contents
+
+
+WORKER = """
+import logging
+import logging.config
+
+from blogPost.settings import base
+
+base.LOG_DIR = base.Path({log_dir!r})
+logging.config.dictConfig({{
+    "version": 1,
+    "formatters": base.LOGGING["formatters"],
+    "handlers": {{
+        "file": base.log_file_handler("request.log", "INFO"),
+        "queue": base.log_queue_handler("file"),
+    }},
+    "loggers": {{"pipeline": {{"handlers": ["queue"], "level": "INFO"}}}},
+}})
+for i in range(500):
+    logging.getLogger("pipeline").info("record %s", i, extra={{"request_id": i}})
+"""
+
+
+def test_settings_pipeline_drains_on_exit(tmp_path):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "blogPost.settings.base"}
+    subprocess.run(
+        [sys.executable, "-c", WORKER.format(log_dir=str(tmp_path))],
+        cwd=settings.BASE_DIR,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+
+    lines = (tmp_path / "request.log").read_text().splitlines()
+    assert len(lines) == 500
+    assert '"request_id": 499' in lines[-1]
+
+
+ROTATING_WORKER = """
+import logging
+import sys
+
+import pytest
+import time
+
+from app.core.log_pipeline import (
+    BatchRotatingFileHandler,
+    BatchTimedRotatingFileHandler,
+)
+
+handler = {handler}
+worker = sys.argv[1]
+for batch in range(20):
+    handler.handle_batch([
+        logging.LogRecord("test", logging.INFO, "", 1, f"{{worker}} {{i}}", None, None)
+        for i in range(batch * 10, batch * 10 + 10)
+    ])
+    time.sleep({pause})
+handler.close()
+"""
+
+
+@pytest.mark.parametrize(
+    "handler, pause, min_backup_size",
+    [
+        # a second rotation of the same file would leave a short backup
+        ("BatchRotatingFileHandler({path!r}, maxBytes=500, backupCount=1000)", 0, 400),
+        # a second rotation in the same second would delete the first backup
+        (
+            "BatchTimedRotatingFileHandler({path!r}, when='S', backupCount=1000)",
+            0.15,
+            1,
+        ),
+    ],
+)
+def test_workers_rotate_shared_files_once(tmp_path, handler, pause, min_backup_size):
+    script = ROTATING_WORKER.format(
+        handler=handler.format(path=str(tmp_path / "app.log")), pause=pause
+    )
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", script, f"worker-{n}"], cwd=settings.BASE_DIR
+        )
+        for n in range(3)
+    ]
+    for worker in workers:
+        assert worker.wait(timeout=60) == 0
+
+    lines = [
+        line
+        for path in tmp_path.glob("app.log*")
+        if not path.name.endswith(".lock")
+        for line in path.read_text().splitlines()
+    ]
+    backups = [path for path in tmp_path.glob("app.log.*") if path.suffix != ".lock"]
+    assert len(backups) >= 2
+    assert all(path.stat().st_size >= min_backup_size for path in backups)
+    assert sorted(lines) == sorted(
+        f"worker-{n} {i}" for n in range(3) for i in range(200)
+    )
@@ -0,0 +1,84 @@
+import logging
+import uuid
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from app.core.log_sampling import LatencyTracker, RouteRateLimiter, sampled
+from app.core.middleware.logging import RequestResponseLoggingMiddleware
+
+
+def test_sampling_is_deterministic_per_request_id():
+    ids = [str(uuid.uuid4()) for _ in range(10_000)]
+
+    kept = [request_id for request_id in ids if sampled(request_id, 0.1)]
+
+    assert 800 < len(kept) < 1200
+    assert all(sampled(request_id, 0.1) for request_id in kept)
+    # raising the rate only adds requests
+    assert all(sampled(request_id, 0.5) for request_id in kept)
+    assert not any(sampled(request_id, 0) for request_id in ids[:100])
+
+
+def test_rate_limit_is_per_route():
+    limiter = RouteRateLimiter(per_second=10)
+
+    assert sum(limiter.allow("GET posts/", now=0) for _ in range(50)) == 10
+    assert limiter.allow("GET users/", now=0)
+    assert sum(limiter.allow("GET posts/", now=0.5) for _ in range(50)) == 5
+
+
+def test_latency_threshold_tracks_the_route_tail():
+    tracker = LatencyTracker(0.99, window=1000, min_samples=100, refresh=50)
+
+    # unknown until enough samples were seen
+    assert not tracker.observe("GET posts/", 5.0)
+    for _ in range(199):
+        tracker.observe("GET posts/", 0.01)
+
+    assert tracker.observe("GET posts/", 0.5)
+    assert not tracker.observe("GET posts/", 0.01)
+    assert not tracker.observe("GET users/", 0.5)
+
+
+def _log_level(middleware, request_id, duration=0.01, method="GET"):
+    request = RequestFactory().generic(method, "/api/v2/posts/")
+    request.request_id = request_id
+    request.resolver_match = None
+    level, _ = middleware._get_log_level(request, HttpResponse(), duration)
+    return level
+
+
+def test_successful_reads_are_sampled(settings):
+    settings.LOG_SAMPLING = True
+    settings.LOG_SAMPLING_RATE = 0.5
+    settings.LOG_SAMPLING_MAX_PER_SECOND = 1000
+    middleware = RequestResponseLoggingMiddleware(lambda request: HttpResponse())
+    ids = [str(uuid.uuid4()) for _ in range(100)]
+
+    logged = [request_id for request_id in ids if _log_level(middleware, request_id)]
+
+    assert logged == [request_id for request_id in ids if sampled(request_id, 0.5)]
+
+
+def test_slow_reads_are_always_logged(settings):
+    settings.LOG_SAMPLING = True
+    settings.LOG_SAMPLING_RATE = 0
+    settings.LOG_SLOW_MIN_SAMPLES = 100
+    middleware = RequestResponseLoggingMiddleware(lambda request: HttpResponse())
+
+    levels = [_log_level(middleware, str(i)) for i in range(200)]
+    slow = _log_level(middleware, "slow", duration=2.0)
+
+    assert set(levels) == {None}
+    assert slow == logging.INFO
+
+
+def test_made_up_methods_share_the_route_state(settings):
+    settings.LOG_SAMPLING = True
+    middleware = RequestResponseLoggingMiddleware(lambda request: HttpResponse())
+
+    for number in range(50):
+        _log_level(middleware, str(number), method=f"VERB{number}")
+
+    assert len(middleware.latency._routes) == 1
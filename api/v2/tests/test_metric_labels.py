@@ -0,0 +1,75 @@
+import uuid
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from prometheus_client import REGISTRY
+
+from app.core.middleware.monitoring.middleware import (
+    OTHER_METHOD,
+    OVERFLOW_ENDPOINT,
+    UNMATCHED_ENDPOINT,
+    PrometheusMiddleware,
+)
+
+
+def _request_series():
+    return {
+        tuple(sorted(sample.labels.items()))
+        for metric in REGISTRY.collect()
+        if metric.name == "api_request"
+        for sample in metric.samples
+        if sample.name == "api_request_total"
+    }
+
+
+def _middleware():
+    return PrometheusMiddleware(lambda request: HttpResponse())
+
+
+def test_distinct_ids_share_one_series(db):
+    middleware = _middleware()
+    rf = RequestFactory()
+    before = _request_series()
+
+    for _ in range(10_000):
+        middleware(rf.get(f"/api/v2/posts/{uuid.uuid4()}/"))
+
+    added = _request_series() - before
+    assert len(added) <= 1
+    assert all(
+        dict(labels)["endpoint"] == "api/v2/posts/<uuid:post_id>/" for labels in added
+    )
+
+
+def test_unknown_paths_are_bucketed(db):
+    middleware = _middleware()
+    rf = RequestFactory()
+
+    assert middleware.endpoint(rf.get("/nope/")) == UNMATCHED_ENDPOINT
+    assert middleware.endpoint(rf.get(f"/api/v2/{uuid.uuid4()}/")) == (
+        UNMATCHED_ENDPOINT
+    )
+
+
+def test_label_sets_are_capped(settings, db):
+    settings.PROMETHEUS_MAX_ENDPOINTS = 1
+    middleware = _middleware()
+    rf = RequestFactory()
+    post = rf.get(f"/api/v2/posts/{uuid.uuid4()}/")
+
+    assert middleware.endpoint(post) == "api/v2/posts/<uuid:post_id>/"
+    assert middleware.endpoint(rf.get("/api/v2/posts/")) == OVERFLOW_ENDPOINT
+    # routes already seen keep their label
+    assert middleware.endpoint(post) == "api/v2/posts/<uuid:post_id>/"
+
+
+def test_unknown_methods_share_one_label(db):
+    middleware = _middleware()
+    rf = RequestFactory()
+    before = _request_series()
+
+    for number in range(100):
+        middleware(rf.generic(f"VERB{number}", "/api/v2/posts/"))
+
+    added = _request_series() - before
+    assert {dict(labels)["method"] for labels in added} == {OTHER_METHOD}
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from prometheus_client import multiprocess
+
+from app.core.middleware.monitoring.views import metrics_registry
+
+WORKER = """
+import django
+
+django.setup()
+
+from app.core.middleware.monitoring.middleware import IN_PROGRESS, REQUEST_COUNT
+
+for _ in range({requests}):
+    REQUEST_COUNT.labels("GET", "api/v2/posts/", 200).inc()
+IN_PROGRESS.labels("GET", "api/v2/posts/").inc()
+"""
+
+
+def _run_workers(path, count, requests):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "blogPost.settings.base",
+        "PROMETHEUS_MULTIPROC_DIR": str(path),
+    }
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER.format(requests=requests)],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        for _ in range(count)
+    ]
+    for worker in workers:
+        assert worker.wait(timeout=60) == 0
+    return [worker.pid for worker in workers]
+
+
+def _sample(name, **labels):
+    return metrics_registry().get_sample_value(name, labels)
+
+
+def test_scrape_aggregates_every_worker(settings, tmp_path):
+    settings.PROMETHEUS_MULTIPROC_DIR = str(tmp_path)
+    labels = {"method": "GET", "endpoint": "api/v2/posts/"}
+
+    pids = _run_workers(tmp_path, count=3, requests=5)
+
+    assert _sample("api_request_total", http_status="200", **labels) == 15
+    assert _sample("api_request_in_progress", **labels) == 3
+
+    # what the gunicorn child_exit hook does for a worker that died
+    multiprocess.mark_process_dead(pids[0], path=str(tmp_path))
+
+    assert _sample("api_request_total", http_status="200", **labels) == 15
+    assert _sample("api_request_in_progress", **labels) == 2
+
+
+def test_scrape_uses_process_registry_by_default(settings, api_cl):
+    settings.PROMETHEUS_MULTIPROC_DIR = ""
+
+    response = api_cl.get(
+        "/metrics/", HTTP_AUTHORIZATION=f"Bearer {settings.PROMETHEUS_SCRAPE_TOKEN}"
+    )
+
+    assert response.status_code == 200
+    assert b"api_request_total" in response.content
@@ -0,0 +1,77 @@
+import factory
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from api.v2.tests.factories.comment_factory import CommentFactory
+from api.v2.tests.factories.post_factory import PostFactory
+from app.comment.models import Comment
+from app.post.models import Post
+
+
+def _walk(api_cl, url):
+    ids, pages = [], 0
+    while url:
+        response = api_cl.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        ids.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+        pages += 1
+    return ids, pages
+
+
+@pytest.fixture
+def many_posts(db, users):
+    return PostFactory.create_batch(
+        25, author=factory.Iterator(users), is_published=True
+    )
+
+
+class TestCursorPagination:
+    def test_cursor_pages_cover_every_post_once_in_order(self, many_posts, api_cl):
+        ids, pages = _walk(api_cl, reverse("v2:posts") + "?cursor=")
+
+        expected = Post.objects.order_by("-created_at", "id").values_list(
+            "id", flat=True
+        )
+        assert ids == [str(pk) for pk in expected]
+        assert pages == 3
+
+    def test_previous_link_returns_the_previous_page(self, many_posts, api_cl):
+        first = api_cl.get(reverse("v2:posts") + "?cursor=")
+        second = api_cl.get(first.data["next"])
+        back = api_cl.get(second.data["previous"])
+
+        assert first.data["previous"] is None
+        assert [p["id"] for p in back.data["results"]] == [
+            p["id"] for p in first.data["results"]
+        ]
+        assert back.data["previous"] is None
+
+    def test_comment_cursor_breaks_ties_on_id(self, users, published_posts, api_cl):
+        post = published_posts[0]
+        CommentFactory.create_batch(23, author=factory.Iterator(users), post=post)
+
+        ids, _ = _walk(api_cl, reverse("v2:comments", args=[post.id]) + "?cursor=")
+
+        expected = Comment.objects.filter(post=post).order_by(
+            "-like_count", "-reply_count", "-created_at", "id"
+        )
+        assert ids == [str(c.id) for c in expected]
+
+    def test_approximate_count_is_opt_in(self, many_posts, api_cl):
+        response = api_cl.get(reverse("v2:posts") + "?cursor=&count=approx")
+
+        assert response.data["count"] == 25
+
+    def test_invalid_cursor_returns_404(self, many_posts, api_cl):
+        response = api_cl.get(reverse("v2:posts") + "?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_page_number_mode_is_unchanged(self, many_posts, api_cl):
+        response = api_cl.get(reverse("v2:posts") + "?page=2")
+
+        assert response.data["count"] == 25
+        assert len(response.data["results"]) == 10
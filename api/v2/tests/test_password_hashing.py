@@ -0,0 +1,147 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.db import connection
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from api.v2.tests.factories.user_factory import UserFactory
+from app.core.security import hashing
+from app.core.security.hashing import (
+    PasswordHashExecutor,
+    PasswordHashingBusy,
+    PooledPBKDF2PasswordHasher,
+)
+
+
+class FastPooledHasher(PooledPBKDF2PasswordHasher):
+    iterations = 1000
+
+
+class BlockingPooledHasher(FastPooledHasher):
+    # hashes hold their hashing thread until release is set
+    release = threading.Event()
+
+    def encode(self, password, salt, iterations=None):
+        return hashing.get_executor().run(self._encode, password, salt, iterations)
+
+    def _encode(self, password, salt, iterations):
+        self.release.wait(5)
+        return PBKDF2PasswordHasher.encode(self, password, salt, iterations)
+
+
+def _rejected(reason):
+    labels = {"reason": reason}
+    return REGISTRY.get_sample_value("password_hash_rejected_total", labels) or 0
+
+
+def _occupy(executor):
+    """
+    Holds one hashing thread until the returned event is set.
+    """
+    release, running = threading.Event(), threading.Event()
+
+    def block():
+        running.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=executor.run, args=(block,))
+    thread.start()
+    running.wait(5)
+    return release, thread
+
+
+def test_saturated_pool_rejects_at_once():
+    executor = PasswordHashExecutor(workers=1, queue=0, queue_timeout=5)
+    release, thread = _occupy(executor)
+    before = _rejected("saturated")
+
+    with pytest.raises(PasswordHashingBusy):
+        executor.run(lambda: "hash")
+
+    release.set()
+    thread.join()
+    assert _rejected("saturated") == before + 1
+    assert executor.run(lambda: "hash") == "hash"
+
+
+def test_hash_not_started_in_time_is_rejected():
+    executor = PasswordHashExecutor(workers=1, queue=1, queue_timeout=0.05)
+    release, thread = _occupy(executor)
+    before = _rejected("timeout")
+
+    with pytest.raises(PasswordHashingBusy):
+        executor.run(lambda: "hash")
+
+    release.set()
+    thread.join()
+    assert _rejected("timeout") == before + 1
+    assert executor.run(lambda: "hash") == "hash"
+
+
+def test_pooled_hashes_are_plain_pbkdf2():
+    encoded = make_password("s3cret-pass", hasher=FastPooledHasher())
+
+    assert PBKDF2PasswordHasher().verify("s3cret-pass", encoded)
+    assert FastPooledHasher().verify("s3cret-pass", encoded)
+    assert not FastPooledHasher().verify("wrong", encoded)
+
+
+def test_login_storm_gets_429(settings, db, api_cl, monkeypatch):
+    settings.PASSWORD_HASHERS = [f"{__name__}.FastPooledHasher"]
+    UserFactory(email="storm@example.com", password="s3cret-pass")
+    executor = PasswordHashExecutor(workers=1, queue=0, queue_timeout=5)
+    monkeypatch.setattr(hashing, "_executor", executor)
+    release, thread = _occupy(executor)
+
+    response = api_cl.post(
+        reverse("v2:login"),
+        {"email": "storm@example.com", "password": "s3cret-pass"},
+        format="json",
+    )
+
+    release.set()
+    thread.join()
+    assert response.status_code == 429
+    assert response["Retry-After"] == "1"
+    assert response.json()["detail"].startswith("Too many logins")
+
+
+def _request(method, url, data=None):
+    # one request on its own thread and connection, like a gthread worker
+    try:
+        return getattr(APIClient(), method)(url, data, format="json")
+    finally:
+        connection.close()
+
+
+def test_reads_are_served_during_a_login_storm(
+    settings, transactional_db, published_posts, monkeypatch
+):
+    settings.PASSWORD_HASHERS = [f"{__name__}.FastPooledHasher"]
+    UserFactory(email="storm@example.com", password="s3cret-pass")
+    settings.PASSWORD_HASHERS = [f"{__name__}.BlockingPooledHasher"]
+    monkeypatch.setattr(hashing, "_executor", None)  # sized from the settings
+    BlockingPooledHasher.release.clear()
+    credentials = {"email": "storm@example.com", "password": "wrong-pass"}
+
+    # as many logins as the worker has request threads, then a read
+    with ThreadPoolExecutor(settings.WEB_THREADS) as threads:
+        logins = [
+            threads.submit(_request, "post", reverse("v2:login"), credentials)
+            for _ in range(settings.WEB_THREADS)
+        ]
+        read = threads.submit(_request, "get", reverse("v2:posts"))
+        try:
+            assert read.result(timeout=1).status_code == 200
+        finally:
+            BlockingPooledHasher.release.set()
+        rejected = [
+            login.result() for login in logins if login.result().status_code == 429
+        ]
+
+    assert rejected
+    assert rejected[0].json()["detail"].startswith("Too many logins")
@@ -0,0 +1,50 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.generics import ListAPIView
+from rest_framework.views import APIView
+
+from app.core.instrumentation import phase_timing_mixins
+
+PHASES = ["authentication", "permissions", "throttles", "queryset", "serialize"]
+
+
+def _count(view, phase):
+    labels = {"view": view, "phase": phase}
+    return REGISTRY.get_sample_value("api_view_phase_seconds_count", labels) or 0
+
+
+@pytest.mark.parametrize("phase", PHASES + ["render"])
+def test_list_view_phases_are_observed(api_cl, published_posts, phase):
+    before = _count("v2:posts", phase)
+
+    response = api_cl.get(reverse("v2:posts"))
+
+    assert response.status_code == 200
+    assert _count("v2:posts", phase) > before
+
+
+def test_detail_lookup_is_the_queryset_phase(api_cl, published_posts):
+    post = published_posts[0]
+    before = _count("v2:post-detail", "queryset")
+
+    response = api_cl.get(reverse("v2:post-detail", args=[post.id]))
+
+    assert response.status_code == 200
+    assert response.json()["id"] == str(post.id)
+    assert _count("v2:post-detail", "queryset") == before + 1
+
+
+def test_disabled_timing_keeps_the_stock_methods():
+    api_mixin, generic_mixin = phase_timing_mixins(False)
+
+    class View(api_mixin, APIView):
+        pass
+
+    class ListView(generic_mixin, ListAPIView):
+        pass
+
+    assert View.perform_authentication is APIView.perform_authentication
+    assert View.finalize_response is APIView.finalize_response
+    assert ListView.get_serializer is ListAPIView.get_serializer
+    assert ListView.paginate_queryset is ListAPIView.paginate_queryset
@@ -0,0 +1,122 @@
+import re
+
+import pytest
+from django.apps import apps
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.v2.tests.factories.user_factory import UserFactory
+
+
+def _list_views(patterns=None):
+    if patterns is None:
+        patterns = get_resolver("api.v2.urls").url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _list_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class and issubclass(view_class, ListModelMixin):
+                kwargs = list(pattern.pattern.converters)
+                yield pytest.param(pattern.name, view_class, kwargs, id=pattern.name)
+
+
+class _Recorder:
+    """
+    Stands in for a model instance during serialization and records which
+    attributes the serializer reads, nested related objects included.
+    """
+
+    def __init__(self, instance, reads):
+        self._instance = instance
+        self._reads = reads
+
+    def __getattr__(self, name):
+        self._reads.add((type(self._instance), name))
+        value = getattr(self._instance, name)
+        if isinstance(value, models.Model):
+            return _Recorder(value, self._reads)
+        return value
+
+    def serializable_value(self, name):  # pk-only relations
+        self._reads.add((type(self._instance), name))
+        return self._instance.serializable_value(name)
+
+
+def _selected_columns(queries, model):
+    """
+    Returns the (model, column) pairs selected by the queries reading from
+    model's table, joined tables included.
+    """
+    models_by_table = {model._meta.db_table: model for model in apps.get_models()}
+    columns = set()
+    for query in queries:
+        select, _, rest = query["sql"].partition(" FROM ")
+        if not rest.startswith(f'"{model._meta.db_table}"'):
+            continue
+        for table, column in re.findall(r'"(\w+)"\."(\w+)"', select):
+            if table in models_by_table:
+                columns.add((models_by_table[table], column))
+    return columns
+
+
+def _read_columns(reads):
+    columns = set()
+    for model, name in reads:
+        try:
+            field = model._meta.get_field(name)
+        except Exception:
+            continue  # annotations and attributes set by the view
+        if field.concrete:
+            columns.add((model, field.attname))
+    return columns
+
+
+@pytest.fixture
+def seeded(users, published_posts, draft_posts, comments, replies):
+    return {
+        "post_id": published_posts[0].id,
+        "comment_id": comments[0].id,
+    }
+
+
+@pytest.mark.parametrize("name, view_class, kwarg_names", list(_list_views()))
+def test_list_view_loads_only_columns_its_serializer_reads(
+    seeded, name, view_class, kwarg_names, django_assert_num_queries
+):
+    admin = UserFactory(is_staff=True, is_superuser=True)
+    kwargs = {key: seeded[key] for key in kwarg_names}
+    url = reverse(f"v2:{name}", kwargs=kwargs)
+
+    def request():
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=admin)
+        return request
+
+    # the columns the endpoint itself selects
+    with CaptureQueriesContext(connection) as queries:
+        response = view_class.as_view()(request(), **kwargs)
+    assert response.status_code == 200
+
+    view = view_class()
+    view.args, view.kwargs, view.format_kwarg = (), kwargs, None
+    view.request = view.initialize_request(request())
+    view.request.user  # run authentication
+
+    queryset = view.filter_queryset(view.get_queryset())
+    instances = list(queryset[:20])
+    assert instances, f"{name} returned nothing to check"
+    loaded = _selected_columns(queries.captured_queries, queryset.model)
+    assert loaded, f"{name} ran no query on {queryset.model._meta.db_table}"
+
+    reads = set()
+    with django_assert_num_queries(0):  # no deferred column is fetched
+        view.get_serializer(instances, many=True).data
+    view.get_serializer([_Recorder(obj, reads) for obj in instances], many=True).data
+
+    pks = {(model, model._meta.pk.attname) for model, _ in loaded}
+    unread = loaded - _read_columns(reads) - pks
+    assert not unread, f"{name} loads columns it never serializes: {unread}"
@@ -0,0 +1,68 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIRequestFactory
+
+from api.v2.post.views import PostListCreateAPIView
+from app.core import budgets
+from app.core.budgets import QueryBudget, QueryBudgetExceeded
+
+
+def _violations(view, method, kind):
+    labels = {"view": view, "method": method, "kind": kind}
+    return REGISTRY.get_sample_value("api_query_budget_violations_total", labels) or 0
+
+
+@pytest.fixture
+def tight_budget(monkeypatch):
+    monkeypatch.setitem(
+        budgets.BUDGETS, "v2:posts", {"GET": QueryBudget(queries=1, db_time=10)}
+    )
+
+
+def test_endpoints_within_budget_pass(api_cl, published_posts):
+    assert api_cl.get(reverse("v2:posts")).status_code == 200
+
+
+def test_requests_over_budget_fail_the_test(api_cl, published_posts, tight_budget):
+    with pytest.raises(QueryBudgetExceeded, match="GET v2:posts ran"):
+        api_cl.get(reverse("v2:posts"))
+
+
+def test_sampled_violations_are_counted_in_production(
+    api_cl, published_posts, tight_budget, settings
+):
+    settings.QUERY_BUDGET_RAISE = False
+    before = _violations("v2:posts", "GET", "queries")
+
+    response = api_cl.get(reverse("v2:posts"))
+
+    assert response.status_code == 200
+    assert _violations("v2:posts", "GET", "queries") == before + 1
+    assert _violations("v2:posts", "GET", "db_time") == 0
+
+
+def test_unsampled_requests_are_not_metered(
+    api_cl, published_posts, tight_budget, settings
+):
+    settings.QUERY_BUDGET_SAMPLE_RATE = 0
+
+    assert api_cl.get(reverse("v2:posts")).status_code == 200
+
+
+def test_query_budget_fixture_checks_direct_view_calls(
+    published_posts, tight_budget, query_budget
+):
+    view = PostListCreateAPIView.as_view()
+    request = APIRequestFactory().get(reverse("v2:posts"))
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget("v2:posts") as meter:
+            view(request)
+
+    assert meter.queries > 1
+
+
+@pytest.mark.no_query_budget
+def test_marked_tests_are_not_enforced(api_cl, published_posts, tight_budget):
+    assert api_cl.get(reverse("v2:posts")).status_code == 200
@@ -0,0 +1,53 @@
+import logging
+
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from app.core.middleware.monitoring.middleware import UNMATCHED_ENDPOINT
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_db_work_is_exported_per_view_and_method(api_cl, published_posts):
+    labels = {"method": "GET", "view": "v2:posts"}
+    requests = _sample("api_request_db_queries_count", **labels)
+    queries = _sample("api_request_db_queries_sum", **labels)
+    slowest = _sample("api_request_db_slowest_query_seconds_count", **labels)
+
+    assert api_cl.get(reverse("v2:posts")).status_code == 200
+
+    assert _sample("api_request_db_queries_count", **labels) == requests + 1
+    assert _sample("api_request_db_queries_sum", **labels) > queries
+    assert _sample("api_request_db_duration_seconds_sum", **labels) > 0
+    assert _sample("api_request_db_slowest_query_seconds_count", **labels) == (
+        slowest + 1
+    )
+
+
+def test_unresolved_paths_share_one_label(api_cl, db):
+    before = _sample(
+        "api_request_db_queries_count", method="GET", view=UNMATCHED_ENDPOINT
+    )
+
+    api_cl.get("/api/v2/does-not-exist/")
+
+    after = _sample(
+        "api_request_db_queries_count", method="GET", view=UNMATCHED_ENDPOINT
+    )
+    assert after == before + 1
+
+
+def test_request_log_carries_db_work(api_cl, published_posts, caplog):
+    logger = logging.getLogger("request_logger")  # does not propagate
+    logger.addHandler(caplog.handler)
+    try:
+        api_cl.get(reverse("v2:posts"))
+    finally:
+        logger.removeHandler(caplog.handler)
+
+    record = next(r for r in caplog.records if r.name == "request_logger")
+    assert record.db_queries >= 1
+    assert record.db_time_ms >= record.db_slowest_ms > 0
+    assert record.db_slowest_sql.startswith("SELECT")
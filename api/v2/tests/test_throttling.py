@@ -0,0 +1,114 @@
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from app.core.security.throttling import buckets
+from app.core.security.throttling.base import BaseUserOrIPThrottle
+from app.core.security.throttling.buckets import (
+    LocalTokenBucket,
+    RedisTokenBucket,
+    TokenBucketLimiter,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(LocalTokenBucket):
+    calls = 0
+
+    def consume(self, key, capacity, rate):
+        self.calls += 1
+        return super().consume(key, capacity, rate)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter(monkeypatch):
+    monkeypatch.setattr(buckets, "_limiter", None)
+
+
+def test_bucket_allows_a_burst_then_refills():
+    clock = Clock()
+    bucket = LocalTokenBucket(clock=clock)
+
+    assert [bucket.consume("k", 3, 1.0)[0] for _ in range(3)] == [True] * 3
+    assert bucket.consume("k", 3, 1.0) == (False, 1.0)
+    assert bucket.consume("other", 3, 1.0)[0]
+
+    clock.now += 1
+    assert bucket.consume("k", 3, 1.0)[0]
+    assert not bucket.consume("k", 3, 1.0)[0]
+
+
+def test_denied_clients_are_refused_without_a_backend_call():
+    clock = Clock()
+    backend = CountingBackend(clock=clock)
+    limiter = TokenBucketLimiter(backend, clock=clock)
+
+    limiter.consume("k", 1, 0.5)
+    assert limiter.consume("k", 1, 0.5) == (False, 2.0)
+    calls = backend.calls
+
+    clock.now += 1
+    assert limiter.consume("k", 1, 0.5) == (False, 1.0)
+    assert backend.calls == calls
+
+    clock.now += 1
+    assert limiter.consume("k", 1, 0.5)[0]
+    assert backend.calls == calls + 1
+
+
+def test_backend_errors_fail_open():
+    class Down:
+        def consume(self, key, capacity, rate):
+            raise ConnectionError("redis is down")
+
+    assert TokenBucketLimiter(Down()).consume("k", 1, 1.0) == (True, 0.0)
+
+
+def test_redis_bucket_is_one_script_call():
+    calls = []
+
+    class Client:
+        def register_script(self, script):
+            def run(keys, args):
+                calls.append((keys, args))
+                return [0, "1.5"]
+
+            return run
+
+    assert RedisTokenBucket(Client()).consume("k", 10, 0.2) == (False, 1.5)
+    assert calls == [(["k"], [10, 0.2])]
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [
+        type(
+            "TwoPerMinute",
+            (BaseUserOrIPThrottle,),
+            {"scope": "test", "rate": "2/min"},
+        )
+    ]
+
+    def get(self, request):
+        return Response({})
+
+
+def test_throttle_answers_429_with_retry_after():
+    view = ThrottledView.as_view()
+    rf = APIRequestFactory()
+
+    statuses = [view(rf.get("/", REMOTE_ADDR="10.1.1.1")).status_code for _ in range(3)]
+    throttled = view(rf.get("/", REMOTE_ADDR="10.1.1.1"))
+
+    assert statuses == [200, 200, 429]
+    assert 0 < int(throttled["Retry-After"]) <= 30
+    assert view(rf.get("/", REMOTE_ADDR="10.1.1.2")).status_code == 200
@@ -0,0 +1,148 @@
+import io
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.core.security import blacklist
+from app.core.security.blacklist import BlacklistFilter, FilteredRefreshToken, LocalBits
+
+
+@pytest.fixture(autouse=True)
+def fresh_filter(monkeypatch):
+    monkeypatch.setattr(blacklist, "_filter", None)
+
+
+def test_filter_has_no_false_negatives_and_few_false_positives(db):
+    bloom = BlacklistFilter(LocalBits(), capacity=1000, error_rate=0.01)
+    bloom.rebuild()
+    added = [str(uuid.uuid4()) for _ in range(1000)]
+    for jti in added:
+        bloom.add(jti)
+
+    others = [str(uuid.uuid4()) for _ in range(10_000)]
+
+    assert all(bloom.might_contain(jti) for jti in added)
+    assert sum(bloom.might_contain(jti) for jti in others) < 300
+
+
+def test_unlisted_tokens_are_checked_without_sql(users):
+    FilteredRefreshToken.for_user(users[1]).blacklist()
+    blacklist.get_filter().rebuild()  # done by the first check of a worker
+    raw = str(FilteredRefreshToken.for_user(users[0]))
+
+    with CaptureQueriesContext(connection) as queries:
+        FilteredRefreshToken(raw)
+
+    assert len(queries) == 0
+
+
+def test_blacklisted_tokens_are_refused(users):
+    token = FilteredRefreshToken.for_user(users[0])
+    FilteredRefreshToken(str(token))  # builds the filter first
+    token.blacklist()
+
+    with pytest.raises(TokenError):
+        FilteredRefreshToken(str(token))
+
+
+def test_filter_is_rebuilt_from_the_table(users):
+    token = RefreshToken.for_user(users[0])
+    token.blacklist()  # straight to the table, the filter never saw it
+
+    with pytest.raises(TokenError):
+        FilteredRefreshToken(str(token))
+
+
+def test_rebuild_replays_tokens_blacklisted_by_a_lagging_clock(users, monkeypatch):
+    token = FilteredRefreshToken.for_user(users[0])
+    full_scan = blacklist.blacklisted_jtis
+
+    def blacklisted_jtis(since=None):
+        jtis = list(full_scan(since))
+        if since is None:
+            # logged out on another host, whose clock is behind, while the
+            # filter was being built
+            token.blacklist()
+            BlacklistedToken.objects.update(
+                blacklisted_at=timezone.now() - timedelta(seconds=30)
+            )
+        return jtis
+
+    monkeypatch.setattr(blacklist, "blacklisted_jtis", blacklisted_jtis)
+    blacklist.get_filter().rebuild()
+
+    assert blacklist.get_filter().might_contain(token.payload["jti"])
+
+
+def test_checks_query_the_table_while_another_request_rebuilds(users):
+    token = RefreshToken.for_user(users[0])
+    token.blacklist()
+    lock = blacklist.get_filter().store.lock()
+    lock.acquire()
+
+    try:
+        with pytest.raises(TokenError):
+            FilteredRefreshToken(str(token))
+        assert blacklist.get_filter().store.bits is None  # left to the holder
+    finally:
+        lock.release()
+
+
+def test_filter_lost_right_after_a_rebuild_answers_maybe(users):
+    class Vanishing(LocalBits):
+        # dropped (evicted, or cleared by another worker) once written
+        def replace(self, bits):
+            pass
+
+    bloom = BlacklistFilter(Vanishing(), capacity=1000, error_rate=0.01)
+
+    assert bloom.might_contain(str(uuid.uuid4())) is True
+
+
+def test_refresh_after_logout_is_refused(users, api_cl):
+    token = FilteredRefreshToken.for_user(users[0])
+    api_cl.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+    api_cl.cookies["refresh_token"] = str(token)
+
+    assert api_cl.post(reverse("v2:logout")).status_code == 204
+    api_cl.cookies["refresh_token"] = str(token)
+    assert api_cl.post(reverse("v2:token-refresh")).status_code == 403
+
+
+def test_prune_deletes_expired_tokens_in_batches(users):
+    now = timezone.now()
+    expired = [
+        OutstandingToken.objects.create(
+            jti=f"expired-{i}", token="x", expires_at=now - timedelta(days=1)
+        )
+        for i in range(5)
+    ]
+    BlacklistedToken.objects.create(token=expired[0])
+    live = OutstandingToken.objects.create(
+        jti="live", token="x", expires_at=now + timedelta(days=1)
+    )
+    BlacklistedToken.objects.create(token=live)
+
+    call_command("prune_tokens", batch_size=2, stdout=io.StringIO())
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+    assert BlacklistedToken.objects.get().token == live
+    assert blacklist.get_filter().might_contain("live")
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_prune_rejects_batch_sizes_below_one(db, batch_size):
+    with pytest.raises(CommandError):
+        call_command("prune_tokens", batch_size=batch_size, stdout=io.StringIO())
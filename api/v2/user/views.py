@@ -7,12 +7,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from api.v2.user.serializer import UserSerializer
+from app.core.instrumentation import APIViewMixin, GenericViewMixin
 from app.core.permissions import IsAdminOrSelf, IsAdminUser, IsAuthenticated
+from app.core.projection import ProjectedListMixin
 
 User = get_user_model()
 
 
-class UserListAPIView(ListAPIView):
+class UserListAPIView(GenericViewMixin, ProjectedListMixin, ListAPIView):
     """
     GET -> user: list all users
     """
@@ -22,7 +24,7 @@ class UserListAPIView(ListAPIView):
     queryset = User.objects.all().order_by("email")
 
 
-class UserRetrieveAPIView(RetrieveAPIView):
+class UserRetrieveAPIView(GenericViewMixin, RetrieveAPIView):
     """
     GET -> user: retrieve a user
     """
@@ -34,7 +36,7 @@ class UserRetrieveAPIView(RetrieveAPIView):
     queryset = User.objects.all()
 
 
-class DisableUserAPIView(APIView):
+class DisableUserAPIView(APIViewMixin, APIView):
     """
     POST -> user: disable a user
     """
@@ -53,7 +55,7 @@ class DisableUserAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class EnableUserAPIView(APIView):
+class EnableUserAPIView(APIViewMixin, APIView):
     """
     POST -> user: enable user
     """
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.comment"
+
+    def ready(self):
+        from app.comment import signals  # noqa: F401
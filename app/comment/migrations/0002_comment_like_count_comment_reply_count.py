@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-17 22:47
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    counted = (
+        queryset.order_by().values(group_by).annotate(total=Count("pk")).values("total")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Like = apps.get_model("like", "Like")
+    Post = apps.get_model("post", "Post")
+    Comment = apps.get_model("comment", "Comment")
+
+    post_type, _ = ContentType.objects.get_or_create(app_label="post", model="post")
+    comment_type, _ = ContentType.objects.get_or_create(
+        app_label="comment", model="comment"
+    )
+
+    Post.objects.update(
+        like_count=_count(
+            Like.objects.filter(content_type=post_type, object_id=OuterRef("pk")),
+            "object_id",
+        ),
+        comment_count=_count(
+            Comment.objects.filter(post=OuterRef("pk"), parent__isnull=True), "post"
+        ),
+    )
+    Comment.objects.update(
+        like_count=_count(
+            Like.objects.filter(content_type=comment_type, object_id=OuterRef("pk")),
+            "object_id",
+        ),
+        reply_count=_count(Comment.objects.filter(parent=OuterRef("pk")), "parent"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0001_initial"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("like", "0001_initial"),
+        ("post", "0003_post_comment_count_post_like_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="reply_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
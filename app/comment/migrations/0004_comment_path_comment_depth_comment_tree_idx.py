@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+
+def path_segment(comment_id, created_at):
+    # frozen copy of app.comment.threads.path_segment
+    micros = int(created_at.timestamp() * 1_000_000)
+    return f"{micros:014x}{comment_id.hex[:6]}"
+
+
+def backfill_paths(apps, schema_editor):
+    Comment = apps.get_model("comment", "Comment")
+
+    parents = {}
+    level = Comment.objects.filter(parent__isnull=True)
+    depth = 0
+    while True:
+        batch = []
+        for comment in level.only("id", "parent_id", "created_at").iterator():
+            prefix = parents.get(comment.parent_id, "")
+            comment.path = prefix + path_segment(comment.id, comment.created_at)
+            comment.depth = depth
+            batch.append(comment)
+        if not batch:
+            break
+
+        Comment.objects.bulk_update(batch, ["path", "depth"], batch_size=1000)
+        parents = {comment.id: comment.path for comment in batch}
+        level = Comment.objects.filter(parent_id__in=list(parents))
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0003_alter_comment_parent_comment_comment_toplevel_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(default="", editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "path"], name="comment_tree_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def make_excerpt(text, words=30):
+    # frozen copy of app.utils.text.make_excerpt
+    if len(text.split()) <= words:
+        return text
+    return Truncator(text).words(words, truncate=" ...")
+
+
+def backfill_excerpts(apps, schema_editor):
+    Comment = apps.get_model("comment", "Comment")
+
+    batch = []
+    for row in Comment.objects.only("id", "content").iterator(chunk_size=1000):
+        row.excerpt = make_excerpt(row.content)
+        batch.append(row)
+        if len(batch) == 1000:
+            Comment.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    Comment.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0004_comment_path_comment_depth_comment_tree_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="excerpt",
+            field=models.TextField(blank=True, default="", editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0005_comment_excerpt"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(editable=False, max_length=2000),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+# subtree_range() and the depth-first order rely on paths comparing
+# bytewise; PostgreSQL databases default to a locale collation (e.g.
+# en_US.utf8) under which "~" sorts before the hex digits. SQLite already
+# compares bytes and has no "C" collation, hence no db_collation on the field.
+SQL = 'ALTER TABLE {table} ALTER COLUMN path TYPE varchar(2000) COLLATE "{collation}"'
+
+
+def _set_collation(collation):
+    def apply(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        table = apps.get_model("comment", "Comment")._meta.db_table
+        schema_editor.execute(
+            SQL.format(table=schema_editor.quote_name(table), collation=collation)
+        )
+
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0006_alter_comment_path"),
+    ]
+
+    operations = [
+        migrations.RunPython(_set_collation("C"), _set_collation("default")),
+    ]
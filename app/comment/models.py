@@ -2,13 +2,17 @@ import uuid
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 from app.like.models import Like
+from app.comment.threads import MAX_DEPTH, PATH_LENGTH, path_segment
 from app.post.models import Post
+from app.utils.models import CounterCacheMixin, ExcerptMixin
 
 
-class Comment(models.Model):
+class Comment(ExcerptMixin, CounterCacheMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -22,13 +26,67 @@ class Comment(models.Model):
         error_messages={"blank": "content field cannot be empty"},
     )
     parent = models.ForeignKey(
-        "self", null=True, blank=True, on_delete=models.CASCADE, related_name="replies"
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="replies",
+        db_index=False,  # covered by comment_replies_idx
     )
+    # first words of content, maintained by ExcerptMixin
+    excerpt = models.TextField(blank=True, editable=False)
+
+    # Materialized thread path and nesting level, see app.comment.threads;
+    # C collation on PostgreSQL (migration 0007), keep it when altering path
+    path = models.CharField(max_length=PATH_LENGTH, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    # Denormalized counters, maintained by app.like.signals/app.comment.signals
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     likes = GenericRelation(Like, related_query_name="likes")
 
+    counter_fields = ("like_count", "reply_count")
+
+    class Meta:
+        indexes = [
+            # top-level comments of a post, in CommentListCreateAPIView order
+            models.Index(
+                fields=["post", "-like_count", "-reply_count", "-created_at", "id"],
+                condition=models.Q(parent__isnull=True),
+                name="comment_toplevel_idx",
+            ),
+            # replies of a comment, in ReplyListCreateAPIView order
+            models.Index(
+                fields=["parent", "-like_count", "-created_at", "id"],
+                condition=models.Q(parent__isnull=False),
+                name="comment_replies_idx",
+            ),
+            # whole threads and subtrees in depth-first order
+            models.Index(fields=["post", "path"], name="comment_tree_idx"),
+        ]
+
+    def clean(self):
+        super().clean()
+        if self.depth > MAX_DEPTH:
+            raise ValidationError(
+                {"parent": f"Replies can be nested at most {MAX_DEPTH} levels deep."}
+            )
+
     def save(self, *args, **kwargs):
+        if self._state.adding and not self.path:
+            self.set_path()
         self.full_clean()
         return super().save(*args, **kwargs)
+
+    def set_path(self):
+        segment = path_segment(self.id, timezone.now())
+        if self.parent_id is None:
+            self.path, self.depth = segment, 0
+        else:
+            self.path = self.parent.path + segment
+            self.depth = self.parent.depth + 1
@@ -0,0 +1,48 @@
+from app.comment.models import Comment
+from app.core.queries import top_k_per_partition
+
+# same order as the top-level comment list (comment_toplevel_idx)
+TOP_COMMENT_ORDERING = ("-like_count", "-reply_count", "-created_at", "id")
+
+
+def attach_top_comments(posts, k=3, queryset=None, to_attr="top_comments"):
+    """
+    Sets ``to_attr`` on every post to its k best top-level comments, loading
+    them for all posts with one window-function query.
+    """
+    posts, by_id = _prepare_posts(posts, to_attr)
+    if posts:
+        for comment in _top_comments(by_id, k, queryset):
+            getattr(by_id[comment.post_id], to_attr).append(comment)
+    return posts
+
+
+async def aattach_top_comments(posts, k=3, queryset=None, to_attr="top_comments"):
+    """
+    attach_top_comments() for async views.
+    """
+    posts, by_id = _prepare_posts(posts, to_attr)
+    if posts:
+        async for comment in _top_comments(by_id, k, queryset):
+            getattr(by_id[comment.post_id], to_attr).append(comment)
+    return posts
+
+
+def _prepare_posts(posts, to_attr):
+    posts = list(posts)
+    by_id = {}
+    for post in posts:
+        setattr(post, to_attr, [])
+        by_id[post.pk] = post
+    return posts, by_id
+
+
+def _top_comments(by_id, k, queryset):
+    if queryset is None:
+        queryset = Comment.objects.select_related("author").defer("content")
+    return top_k_per_partition(
+        queryset.filter(post_id__in=by_id, parent__isnull=True),
+        partition_by=["post_id"],
+        order_by=TOP_COMMENT_ORDERING,
+        k=k,
+    )
@@ -0,0 +1,45 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.comment.models import Comment
+from app.post.models import Post
+from app.utils.signals import counters_changed
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="comment_count_increment")
+def increment_comment_counts(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+
+    if instance.parent_id:
+        Comment.objects.filter(pk=instance.parent_id).update(
+            reply_count=F("reply_count") + 1
+        )
+        counters_changed.send(sender=Comment, pk=instance.parent_id)
+    else:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+        counters_changed.send(sender=Post, pk=instance.post_id)
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid="comment_count_decrement")
+def decrement_comment_counts(sender, instance, origin=None, **kwargs):
+    origin_pk = getattr(origin, "pk", None)
+
+    if instance.parent_id:
+        # cascade from the parent comment (or its post): parent row is gone
+        if origin_pk in (instance.parent_id, instance.post_id):
+            return
+        Comment.objects.filter(pk=instance.parent_id, reply_count__gt=0).update(
+            reply_count=F("reply_count") - 1
+        )
+        counters_changed.send(sender=Comment, pk=instance.parent_id)
+    else:
+        if origin_pk == instance.post_id:
+            return
+        Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+            comment_count=F("comment_count") - 1
+        )
+        counters_changed.send(sender=Post, pk=instance.post_id)
@@ -0,0 +1,48 @@
+"""
+Materialized paths for comment threads.
+
+Every comment stores the path of its parent followed by its own fixed-width
+segment (creation time in microseconds plus part of its id, hex encoded).
+Sorting a post's comments by path yields the whole thread in depth-first
+order, siblings oldest first, and a subtree is the contiguous range of paths
+starting with its root's path, both served by comment_tree_idx.
+"""
+
+SEGMENT_LENGTH = 20
+# deepest reply level the path column has room for (100 segments, 2000
+# characters, well within a PostgreSQL btree index entry)
+MAX_DEPTH = 99
+PATH_LENGTH = SEGMENT_LENGTH * (MAX_DEPTH + 1)
+_PATH_END = "~"  # sorts after every hex digit, bytewise (see migration 0007)
+
+
+def path_segment(comment_id, created_at):
+    micros = int(created_at.timestamp() * 1_000_000)
+    return f"{micros:014x}{comment_id.hex[:6]}"
+
+
+def subtree_range(path):
+    """
+    Returns path__gte/path__lt lookups matching path and all its descendants.
+    """
+    return {"path__gte": path, "path__lt": path + _PATH_END}
+
+
+def nest(nodes, parent_key="parent", children_key="children"):
+    """
+    Turns serialized comments, ordered by path, into a list of root nodes with
+    their descendants under ``children``. Nodes whose parent is not part of
+    ``nodes`` (the root of a subtree) become roots.
+    """
+    by_id = {}
+    roots = []
+    for node in nodes:
+        node[children_key] = []
+        by_id[str(node["id"])] = node
+
+        parent = by_id.get(str(node[parent_key]))
+        if parent is None:
+            roots.append(node)
+        else:
+            parent[children_key].append(node)
+    return roots
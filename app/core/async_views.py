@@ -0,0 +1,111 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.functional import classproperty
+from rest_framework.response import Response
+
+
+# Serves GET as a coroutine when ASYNC_VIEWS is on (SERVER_MODE=asgi):
+# authentication, permissions, throttles and rendering run in the request's
+# sync thread, while the handler fetches its rows through the async ORM and
+# serializes them on the event loop. Every other method runs the sync DRF
+# view in that thread. With ASYNC_VIEWS off the view is the plain sync DRF
+# view.
+#
+# Querysets built by get_queryset() must be lazy; views whose get_queryset()
+# queries override aget_queryset(). (Comments rather than docstrings: view
+# docstrings end up in the OpenAPI schema.)
+class AsyncReadMixin:
+
+    @classproperty
+    def view_is_async(cls):
+        # read by as_view(), so once, when the URLconf is loaded
+        return settings.ASYNC_VIEWS
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.view_is_async:
+            return super().dispatch(request, *args, **kwargs)
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        if request.method != "GET":
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        # APIView.dispatch, with initial() in the sync thread and the
+        # handler awaited
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await self.aget(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        # renderers may query (the browsable API's filter forms do), and the
+        # timing mixin renders in finalize_response()
+        self.response = await sync_to_async(self.finalize_response)(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    async def aget_queryset(self):
+        return self.get_queryset()
+
+
+# ListModelMixin.list as a coroutine, paginated by the paginator's
+# apaginate_queryset() (see PageOrCursorPagination).
+class AsyncListMixin(AsyncReadMixin):
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(await self.aget_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+
+# RetrieveModelMixin.retrieve as a coroutine.
+class AsyncRetrieveMixin(AsyncReadMixin):
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        # GenericAPIView.get_object with the lookup awaited
+        queryset = self.filter_queryset(await self.aget_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,122 @@
+"""
+Per-endpoint database budgets: the most queries, and the most time spent in
+the database, one request to a URL (by view name and method) may cost.
+
+Enforced on every request the test suite sends through the test client
+(app.core.pytest_plugin) and, sampled, in production by
+app.core.middleware.budgets.QueryBudgetMiddleware.
+"""
+
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+QueryBudget = namedtuple("QueryBudget", ["queries", "db_time"])
+
+# unlisted endpoints and methods
+DEFAULT_READ_BUDGET = QueryBudget(queries=8, db_time=0.1)
+DEFAULT_WRITE_BUDGET = QueryBudget(queries=20, db_time=0.25)
+
+READ = QueryBudget(queries=6, db_time=0.1)
+
+# view name -> method -> budget, covering authentication, permission and
+# throttling queries; writes include validation, counters, ranking and
+# cache invalidation
+BUDGETS = {
+    "v2:posts": {"GET": READ, "POST": QueryBudget(queries=16, db_time=0.25)},
+    "v2:post-detail": {
+        "GET": READ,
+        "PATCH": QueryBudget(queries=15, db_time=0.25),
+        "DELETE": QueryBudget(queries=10, db_time=0.25),
+    },
+    "v2:popular": {"GET": QueryBudget(queries=4, db_time=0.05)},
+    "v2:comments": {"GET": READ, "POST": QueryBudget(queries=17, db_time=0.25)},
+    "v2:comment-tree": {"GET": READ},
+    "v2:comment-detail": {
+        "GET": READ,
+        "PATCH": QueryBudget(queries=12, db_time=0.25),
+        "DELETE": QueryBudget(queries=17, db_time=0.25),
+    },
+    "v2:replies": {"GET": READ, "POST": QueryBudget(queries=13, db_time=0.25)},
+    "v2:reply-detail": {
+        "GET": QueryBudget(queries=4, db_time=0.05),
+        "PATCH": QueryBudget(queries=11, db_time=0.25),
+        "DELETE": QueryBudget(queries=9, db_time=0.25),
+    },
+    "v2:all-users": {"GET": QueryBudget(queries=4, db_time=0.1)},
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def budget_for(view_name, method):
+    default = DEFAULT_READ_BUDGET if method in SAFE_METHODS else DEFAULT_WRITE_BUDGET
+    return BUDGETS.get(view_name, {}).get(method, default)
+
+
+class QueryMeter:
+    """
+    Counts the queries run on every database connection, the time spent in
+    them and the slowest statement, while active.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.queries += 1
+            if duration > self.slowest_time:
+                self.slowest_time, self.slowest_sql = duration, sql
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    # Connections belong to a thread. Under ASGI a request's sync code and
+    # async ORM calls all run in its thread-sensitive thread, not on the
+    # event loop, so the wrappers are installed there.
+    async def __aenter__(self):
+        return await sync_to_async(self.__enter__)()
+
+    async def __aexit__(self, *exc_info):
+        await sync_to_async(self.__exit__)(*exc_info)
+
+
+def violations(budget, meter, check_time=True):
+    """
+    Returns the budget kinds ("queries", "db_time") meter went over.
+    """
+    over = []
+    if meter.queries > budget.queries:
+        over.append("queries")
+    if check_time and meter.db_time > budget.db_time:
+        over.append("db_time")
+    return over
+
+
+def describe(endpoint, budget, meter):
+    return (
+        f"{endpoint} ran {meter.queries} queries in "
+        f"{meter.db_time * 1000:.1f} ms (budget: {budget.queries} queries, "
+        f"{budget.db_time * 1000:.0f} ms)"
+    )
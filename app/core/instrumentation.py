@@ -0,0 +1,129 @@
+import time
+
+from django.conf import settings
+from prometheus_client import Histogram
+from rest_framework.response import Response
+
+from app.core.middleware.monitoring.middleware import UNMATCHED_ENDPOINT, view_name
+
+PHASE_LATENCY = Histogram(
+    "api_view_phase_seconds",
+    "Time spent in each phase of a DRF view",
+    ["view", "phase"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+_timed_serializers = {}
+
+
+def timed_serializer_class(serializer_class):
+    """
+    Returns a subclass of serializer_class whose ``data`` is observed as the
+    "serialize" phase. Built once per class.
+    """
+    timed = _timed_serializers.get(serializer_class)
+    if timed is None:
+        timed = type(
+            serializer_class.__name__,
+            (serializer_class,),
+            {"__module__": serializer_class.__module__, "data": _timed_data},
+        )
+        _timed_serializers[serializer_class] = _timed_serializers[timed] = timed
+    return timed
+
+
+@property
+def _timed_data(serializer):
+    start = time.perf_counter()
+    try:
+        return super(type(serializer), serializer).data
+    finally:
+        view = serializer.context.get("view")
+        label = view_name(view.request) if view else UNMATCHED_ENDPOINT
+        PHASE_LATENCY.labels(label, "serialize").observe(time.perf_counter() - start)
+
+
+# Observes the authentication, permission, throttle and render phases of an
+# APIView in api_view_phase_seconds. (Comments rather than docstrings: view
+# docstrings end up in the OpenAPI schema.)
+class TimedAPIViewMixin:
+
+    def timed(self, phase, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            PHASE_LATENCY.labels(view_name(self.request), phase).observe(
+                time.perf_counter() - start
+            )
+
+    async def atimed(self, phase, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            PHASE_LATENCY.labels(view_name(self.request), phase).observe(
+                time.perf_counter() - start
+            )
+
+    def perform_authentication(self, request):
+        self.timed("authentication", super().perform_authentication, request)
+
+    def check_permissions(self, request):
+        self.timed("permissions", super().check_permissions, request)
+
+    def check_throttles(self, request):
+        self.timed("throttles", super().check_throttles, request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # rendered here rather than by the handler so it can be timed; the
+        # handler's own render() call is then a no-op
+        if isinstance(response, Response) and not response.is_rendered:
+            self.timed("render", response.render)
+        return response
+
+
+# TimedAPIViewMixin plus the "queryset" (object lookup or page fetch) and
+# "serialize" (serializer.data) phases of a GenericAPIView.
+class TimedGenericViewMixin(TimedAPIViewMixin):
+
+    def get_object(self):
+        return self.timed("queryset", super().get_object)
+
+    def paginate_queryset(self, queryset):
+        return self.timed("queryset", super().paginate_queryset, queryset)
+
+    # the same for async views (app.core.async_views)
+    async def aget_object(self):
+        return await self.atimed("queryset", super().aget_object)
+
+    async def apaginate_queryset(self, queryset):
+        return await self.atimed("queryset", super().apaginate_queryset, queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if not getattr(self, "swagger_fake_view", False):  # schema generation
+            serializer.__class__ = timed_serializer_class(type(serializer))
+        return serializer
+
+
+class UntimedAPIViewMixin:
+    pass
+
+
+class UntimedGenericViewMixin(UntimedAPIViewMixin):
+    pass
+
+
+def phase_timing_mixins(enabled):
+    """
+    Returns the (APIView, GenericAPIView) mixins to build views on: the timed
+    ones, or empty classes that add no overhead at all.
+    """
+    if enabled:
+        return TimedAPIViewMixin, TimedGenericViewMixin
+    return UntimedAPIViewMixin, UntimedGenericViewMixin
+
+
+APIViewMixin, GenericViewMixin = phase_timing_mixins(settings.API_PHASE_TIMING)
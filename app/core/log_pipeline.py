@@ -0,0 +1,198 @@
+import fcntl
+import functools
+import os
+import queue
+import time
+from contextlib import contextmanager
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+
+from prometheus_client import Counter
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the handler's queue was full",
+    ["handler"],
+)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to a background listener through a bounded queue, so a
+    slow disk never blocks the request thread. When the queue is full the
+    record is dropped and counted instead.
+
+    The listener (set by dictConfig) is started on the first record of every
+    process, which covers gunicorn workers forked after logging was set up.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self._pid = None
+
+    def emit(self, record):
+        # handle() holds self.lock here, so only one thread starts it
+        if self._pid != os.getpid() and self.listener is not None:
+            self.listener._thread = None  # a forked parent's thread is gone
+            self.listener.start()
+            self._pid = os.getpid()
+        super().emit(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(self.name or "unnamed").inc()
+
+    def close(self):
+        # logging.shutdown() closes handlers newest first, so the file
+        # handlers are still open while the listener drains the queue
+        if self._pid == os.getpid():
+            self.listener.stop()
+            self._pid = None
+        super().close()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Takes up to batch_size waiting records at a time and hands them to each
+    handler in one go (see BatchWriteMixin), instead of one write and flush
+    per record.
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level=False, batch_size=100):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size and batch[-1] is not self._sentinel:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._sentinel
+            records = batch[:-1] if stop else batch
+            if records:
+                self.handle_batch(records)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def handle_batch(self, records):
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            accepted = [
+                record
+                for record in records
+                if not self.respect_handler_level or record.levelno >= handler.level
+            ]
+            if not accepted:
+                continue
+            if isinstance(handler, BatchWriteMixin):
+                handler.handle_batch(accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+
+    def enqueue_sentinel(self):
+        # the queue may be full; wait for the listener to make room
+        self.queue.put(self._sentinel)
+
+
+def batching_listener(batch_size=100):
+    """
+    dictConfig ``listener`` factory: the QueueHandler config calls the
+    result with the queue and the target handlers.
+    """
+    return functools.partial(BatchingQueueListener, batch_size=batch_size)
+
+
+class BatchWriteMixin:
+    """
+    Writes a batch of records to a rotating file handler with one write and
+    one flush. Rollover is checked once per batch, so a file can run past
+    maxBytes by at most one batch.
+
+    Every gunicorn worker has its own handler on the same file, so rollover
+    is serialized through an flock()ed ``<file>.lock``: a worker whose file
+    was already rotated by another one reopens the new file rather than
+    rotating it a second time (and overwriting that worker's backup).
+    """
+
+    def handle_batch(self, records):
+        records = [record for record in records if self.filter(record)]
+        if not records:
+            return
+
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+
+        with self.lock:
+            try:
+                with self.rotation_lock():
+                    if self.rotated_elsewhere():
+                        self.reopen()
+                    elif self.shouldRollover(records[-1]):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write("".join(lines))
+                    self.stream.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+    @contextmanager
+    def rotation_lock(self):
+        # flock() locks are shared by forked copies of a descriptor, so
+        # every process opens its own
+        if getattr(self, "_lock_pid", None) != os.getpid():
+            self._lock_file = open(self.baseFilename + ".lock", "a")
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def rotated_elsewhere(self):
+        if self.stream is None:
+            return False
+        try:
+            current = os.stat(self.baseFilename).st_ino
+        except FileNotFoundError:
+            return True
+        return current != os.fstat(self.stream.fileno()).st_ino
+
+    def reopen(self):
+        self.stream.close()
+        self.stream = self._open()
+
+    def close(self):
+        with self.lock:
+            if getattr(self, "_lock_pid", None) == os.getpid():
+                self._lock_file.close()
+                self._lock_pid = None
+        super().close()
+
+
+class BatchRotatingFileHandler(BatchWriteMixin, RotatingFileHandler):
+    pass
+
+
+class BatchTimedRotatingFileHandler(BatchWriteMixin, TimedRotatingFileHandler):
+    def reopen(self):
+        super().reopen()
+        # the rollover this worker was due for has been done
+        self.rolloverAt = self.computeRollover(time.time())
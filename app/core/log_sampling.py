@@ -0,0 +1,76 @@
+import hashlib
+import threading
+import time
+from collections import deque
+
+
+def sampled(request_id, rate):
+    """
+    Deterministic sampling decision for request_id: every worker (and every
+    service passing the same X-Request-ID along) keeps or drops the same
+    requests, so a trace is logged in full or not at all.
+    """
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    digest = hashlib.blake2b(str(request_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") < rate * 2**64
+
+
+class RouteRateLimiter:
+    """
+    Token bucket per route allowing ``per_second`` log lines a second (with
+    bursts of the same size), so log volume stays flat as traffic grows.
+    """
+
+    def __init__(self, per_second):
+        self.per_second = per_second
+        self._buckets = {}  # route -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def allow(self, route, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.get(route, (self.per_second, now))
+            tokens = min(self.per_second, tokens + (now - last) * self.per_second)
+            allowed = tokens >= 1
+            self._buckets[route] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+
+class LatencyTracker:
+    """
+    Tracks the ``percentile`` latency of each route over its last ``window``
+    requests. The threshold is recomputed every ``refresh`` observations and
+    is unknown (nothing counts as slow) until ``min_samples`` were seen.
+    """
+
+    def __init__(self, percentile, window=1000, min_samples=100, refresh=50):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.refresh = refresh
+        self._routes = {}  # route -> [durations, threshold, observations]
+        self._lock = threading.Lock()
+
+    def observe(self, route, duration):
+        """
+        Records duration and returns whether it is above the route's
+        current threshold.
+        """
+        with self._lock:
+            state = self._routes.get(route)
+            if state is None:
+                state = self._routes[route] = [deque(maxlen=self.window), None, 0]
+
+            durations, threshold, observations = state
+            durations.append(duration)
+            observations += 1
+            if observations % self.refresh == 0 and len(durations) >= self.min_samples:
+                ordered = sorted(durations)
+                index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+                threshold = state[1] = ordered[index]
+            state[2] = observations
+
+        return threshold is not None and duration > threshold
@@ -0,0 +1,89 @@
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from prometheus_client import Counter
+
+from app.core.budgets import (
+    QueryBudgetExceeded,
+    QueryMeter,
+    budget_for,
+    describe,
+    violations,
+)
+
+logger = logging.getLogger(__name__)
+
+BUDGET_VIOLATIONS = Counter(
+    "api_query_budget_violations_total",
+    "Sampled requests that went over their endpoint's query budget",
+    ["view", "method", "kind"],
+)
+
+
+class QueryBudgetMiddleware:
+    """
+    Meters the database work of a QUERY_BUDGET_SAMPLE_RATE share of requests
+    against app.core.budgets and counts violations per view and kind.
+    With QUERY_BUDGET_RAISE (the test suite) a violation raises instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        if not self.sampled():
+            return self.get_response(request)
+
+        meter = getattr(request, "query_meter", None)
+        if meter is not None:  # already metered by PrometheusMiddleware
+            response = self.get_response(request)
+        else:
+            with QueryMeter() as meter:
+                response = self.get_response(request)
+        return self.check(request, response, meter)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        meter = getattr(request, "query_meter", None)
+        if meter is not None:
+            response = await self.get_response(request)
+        else:
+            async with QueryMeter() as meter:
+                response = await self.get_response(request)
+        return self.check(request, response, meter)
+
+    def sampled(self):
+        rate = settings.QUERY_BUDGET_SAMPLE_RATE
+        return bool(rate) and random.random() < rate
+
+    def check(self, request, response, meter):
+        match = request.resolver_match
+        if match is None or not match.view_name:
+            return response
+
+        budget = budget_for(match.view_name, request.method)
+        over = violations(budget, meter, check_time=settings.QUERY_BUDGET_CHECK_TIME)
+        if not over:
+            return response
+
+        message = describe(f"{request.method} {match.view_name}", budget, meter)
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+
+        for kind in over:
+            BUDGET_VIOLATIONS.labels(match.view_name, request.method, kind).inc()
+        logger.warning("Query budget exceeded: %s", message)
+        return response
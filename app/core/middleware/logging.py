@@ -1,26 +1,41 @@
 import logging
-import random
 import time
 import uuid
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 
+from app.core.log_sampling import LatencyTracker, RouteRateLimiter, sampled
+
 logger = logging.getLogger("request_logger")
 
 
 class RequestResponseLoggingMiddleware:
     SKIP_PATHS = ["/metrics/", "/health/"]
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.rate_limiter = RouteRateLimiter(settings.LOG_SAMPLING_MAX_PER_SECOND)
+        self.latency = LatencyTracker(
+            settings.LOG_SLOW_PERCENTILE,
+            window=settings.LOG_SLOW_WINDOW,
+            min_samples=settings.LOG_SLOW_MIN_SAMPLES,
+        )
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
         if request.path in self.SKIP_PATHS:
             return self.get_response(request)
 
-        request_id = request.headers.get("X-request-ID") or str(uuid.uuid4())
-        request.request_id = request_id
-
+        request.request_id = self._request_id(request)
         start = time.perf_counter()
         try:
             response = self.get_response(request)
@@ -31,36 +46,83 @@ class RequestResponseLoggingMiddleware:
             )
             raise
 
-        log_level, status = self._get_log_level(request, response)
-
+        duration = time.perf_counter() - start
+        log_level, status = self._get_log_level(request, response, duration)
         if status:
-            if status < 400:
-                message_success = "completed with"
-            elif status < 500:
-                message_success = "returned client error"
-            else:
-                message_success = "failed with server error"
-
-            logger.log(
-                log_level,
-                f"{request.method} {request.path} {message_success} {response.status_code}",
-                extra=self._log_content(request, response, start),
+            extra = self._log_content(request, response, start)
+            self._log(log_level, request, response, extra)
+        return response
+
+    async def __acall__(self, request):
+        if request.path in self.SKIP_PATHS:
+            return await self.get_response(request)
+
+        # request.user may still be the lazy session user, which would query
+        # the database; it is only read in the request's sync thread
+        log_content = sync_to_async(self._log_content)
+
+        request.request_id = self._request_id(request)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            logger.exception(
+                "Request failed",
+                extra=await log_content(request, None, start),
             )
+            raise
 
+        duration = time.perf_counter() - start
+        log_level, status = self._get_log_level(request, response, duration)
+        if status:
+            extra = await log_content(request, response, start)
+            self._log(log_level, request, response, extra)
         return response
 
-    def _get_log_level(self, request, response):
+    def _request_id(self, request):
+        return request.headers.get("X-request-ID") or str(uuid.uuid4())
+
+    def _log(self, log_level, request, response, extra):
+        status = response.status_code
+        if status < 400:
+            message_success = "completed with"
+        elif status < 500:
+            message_success = "returned client error"
+        else:
+            message_success = "failed with server error"
+
+        logger.log(
+            log_level,
+            f"{request.method} {request.path} {message_success} {status}",
+            extra=extra,
+        )
+
+    def _get_log_level(self, request, response, duration):
         if response.status_code in [400, 401, 403, 404, 429]:
             return logging.WARNING, response.status_code
 
         if request.method in ["POST", "PATCH", "DELETE"]:
             return logging.INFO, response.status_code
 
-        # logging rate
-        if settings.LOG_SAMPLING and random.random() >= settings.LOG_SAMPLING_RATE:
-            return None, None
+        if not settings.LOG_SAMPLING:
+            return logging.INFO, response.status_code
+
+        # the URL pattern alone: the method is client controlled, and made-up
+        # verbs (answered 405) would each get a latency window and a bucket
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+
+        # the route's tail latency is always logged
+        if self.latency.observe(route, duration):
+            return logging.INFO, response.status_code
+
+        # the same request ids in every worker, then capped per route and
+        # worker; a worker over its cap drops ids that the others still log
+        if sampled(request.request_id, settings.LOG_SAMPLING_RATE):
+            if self.rate_limiter.allow(route):
+                return logging.INFO, response.status_code
 
-        return logging.INFO, response.status_code
+        return None, None
 
     def _log_content(self, request, response, start):
         duration = (time.perf_counter() - start) * 1000
@@ -70,11 +132,24 @@ class RequestResponseLoggingMiddleware:
             "path": request.path,
             "status_code": getattr(response, "status_code", 500),
             "duration_ms": round(duration, 2),
+            **self._db_content(request),
             "user_id": getattr(request.user, "id", None),
             "ip": self._get_client_ip(request),
             "user_agent": request.headers.get("User-Agent", "")[:100],
         }
 
+    def _db_content(self, request):
+        # set by PrometheusMiddleware, which wraps this middleware
+        meter = getattr(request, "query_meter", None)
+        if meter is None:
+            return {}
+        return {
+            "db_queries": meter.queries,
+            "db_time_ms": round(meter.db_time * 1000, 2),
+            "db_slowest_ms": round(meter.slowest_time * 1000, 2),
+            "db_slowest_sql": (meter.slowest_sql or "")[:200],
+        }
+
     def _get_client_ip(self, request):
         x_forwarded = request.headers.get("X-Forwarded-for")
         return (
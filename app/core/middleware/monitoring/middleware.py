@@ -1,7 +1,13 @@
+import threading
 import time
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.urls import Resolver404, resolve
 from prometheus_client import Counter, Gauge, Histogram
 
+from app.core.budgets import QueryMeter
+
 REQUEST_COUNT = Counter(
     "api_request_total",
     "Total number of API requests",
@@ -15,22 +21,121 @@ REQUEST_LATENCY = Histogram(
 )
 
 IN_PROGRESS = Gauge(
-    "api_request_in_progress", "Requests currently in progress", ["method", "endpoint"]
+    "api_request_in_progress",
+    "Requests currently in progress",
+    ["method", "endpoint"],
+    multiprocess_mode="livesum",
+)
+
+DB_QUERIES = Histogram(
+    "api_request_db_queries",
+    "SQL queries run per request",
+    ["method", "view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, float("inf")),
+)
+
+DB_DURATION = Histogram(
+    "api_request_db_duration_seconds",
+    "Time spent in SQL queries per request",
+    ["method", "view"],
+)
+
+DB_SLOWEST_QUERY = Histogram(
+    "api_request_db_slowest_query_seconds",
+    "Duration of the slowest SQL query of each request",
+    ["method", "view"],
 )
 
 
+UNMATCHED_ENDPOINT = "unmatched"
+OVERFLOW_ENDPOINT = "other"
+
+# the method is client controlled; anything else is counted as "other"
+KNOWN_METHODS = frozenset(
+    ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"]
+)
+OTHER_METHOD = "other"
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match and match.view_name else UNMATCHED_ENDPOINT
+
+
+def method_label(request):
+    return request.method if request.method in KNOWN_METHODS else OTHER_METHOD
+
+
 class PrometheusMiddleware:
+    """
+    Labels request metrics with the URL route pattern (e.g.
+    ``api/v2/posts/<uuid:post_id>/``) rather than the path, so the number of
+    series stays bounded by the URLconf, not by the ids requested.
+
+    Runs natively in both the WSGI and the ASGI handler.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self._endpoints = set()
+        self._lock = threading.Lock()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        start, endpoint = self.started(request)
+        # shared with the budget and logging middlewares through the request
+        with QueryMeter() as meter:
+            request.query_meter = meter
+            response = self.get_response(request)
+        self.finished(request, response, start, endpoint, meter)
+        return response
+
+    async def __acall__(self, request):
+        start, endpoint = self.started(request)
+        async with QueryMeter() as meter:
+            request.query_meter = meter
+            response = await self.get_response(request)
+        self.finished(request, response, start, endpoint, meter)
+        return response
+
+    def started(self, request):
         start = time.perf_counter()
-        IN_PROGRESS.labels(request.method, request.path).inc()
+        endpoint = self.endpoint(request)
+        IN_PROGRESS.labels(method_label(request), endpoint).inc()
+        return start, endpoint
 
-        response = self.get_response(request)
+    def finished(self, request, response, start, endpoint, meter):
         duration = time.perf_counter() - start
-        REQUEST_COUNT.labels(request.method, request.path, response.status_code).inc()
-        REQUEST_LATENCY.labels(request.method, request.path).observe(duration)
-        IN_PROGRESS.labels(request.method, request.path).dec()
+        method = method_label(request)
+        REQUEST_COUNT.labels(method, endpoint, response.status_code).inc()
+        REQUEST_LATENCY.labels(method, endpoint).observe(duration)
+        IN_PROGRESS.labels(method, endpoint).dec()
 
-        return response
+        view = view_name(request)
+        DB_QUERIES.labels(method, view).observe(meter.queries)
+        DB_DURATION.labels(method, view).observe(meter.db_time)
+        DB_SLOWEST_QUERY.labels(method, view).observe(meter.slowest_time)
+
+    def endpoint(self, request):
+        # resolved up front: the in-progress gauge needs the label before
+        # the view runs
+        try:
+            route = resolve(request.path_info).route
+        except Resolver404:
+            return UNMATCHED_ENDPOINT
+
+        if route in self._endpoints:
+            return route
+        with self._lock:
+            if len(self._endpoints) >= settings.PROMETHEUS_MAX_ENDPOINTS:
+                return OVERFLOW_ENDPOINT
+            self._endpoints.add(route)
+        return route
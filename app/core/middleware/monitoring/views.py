@@ -1,9 +1,29 @@
 from django.conf import settings
 from django.http import HttpResponse, HttpResponseForbidden
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
 from rest_framework.views import APIView
 
 
+def metrics_registry():
+    """
+    Returns the registry to scrape: with PROMETHEUS_MULTIPROC_DIR set, a
+    fresh one aggregating the files of every worker, otherwise the process
+    registry.
+    """
+    if not settings.PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=settings.PROMETHEUS_MULTIPROC_DIR)
+    return registry
+
+
 class PrivateMetricsView(APIView):
     authentication_classes = []
     permission_classes = []
@@ -18,4 +38,6 @@ class PrivateMetricsView(APIView):
         if token != settings.PROMETHEUS_SCRAPE_TOKEN:
             return HttpResponseForbidden("Forbidden")
 
-        return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+        return HttpResponse(
+            generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST
+        )
@@ -0,0 +1,226 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, _reverse_ordering
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple("Cursor", ["position", "reverse"])
+
+
+def _cursor_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def approximate_count(queryset):
+    """
+    Returns the planner's row estimate for queryset on PostgreSQL and falls
+    back to an exact COUNT(*) on other backends.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Sending ``?cursor=`` (empty for the first page) paginates over the
+    view's ``cursor_ordering`` with a WHERE clause on the last seen row
+    instead of COUNT(*) + OFFSET, so every page costs the same.
+    ``?count=approx`` adds an estimated total to cursor pages.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        queryset, cursor = self._keyset_queryset(queryset, request, view)
+        if request.query_params.get(self.count_query_param) == "approx":
+            self.count = approximate_count(queryset)
+        return self._keyset_page(list(self._keyset_rows(queryset, cursor)), cursor)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for async views: the count and the page are
+        fetched through the async ORM.
+        """
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return await self._apaginate_numbered(queryset, request)
+
+        queryset, cursor = self._keyset_queryset(queryset, request, view)
+        if request.query_params.get(self.count_query_param) == "approx":
+            self.count = await sync_to_async(approximate_count)(queryset)
+        rows = [row async for row in self._keyset_rows(queryset, cursor)]
+        return self._keyset_page(rows, cursor)
+
+    async def _apaginate_numbered(self, queryset, request):
+        # PageNumberPagination.paginate_queryset with the COUNT(*) and the
+        # page query awaited; the paginator then never touches the database
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()  # a cached_property
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg) from exc
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return list(self.page)
+
+    def _keyset_queryset(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(view.cursor_ordering)
+        self.model = queryset.model
+        self.count = None
+
+        cursor = self.decode_cursor(request)
+        return queryset.order_by(*self._ordering(cursor)), cursor
+
+    def _keyset_rows(self, queryset, cursor):
+        if cursor.position is not None:
+            after = self._after(self._ordering(cursor), cursor.position)
+            queryset = queryset.filter(after)
+        return queryset[: self.page_size + 1]
+
+    def _ordering(self, cursor):
+        return _reverse_ordering(self.ordering) if cursor.reverse else self.ordering
+
+    def _keyset_page(self, results, cursor):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if cursor.reverse:
+            results.reverse()
+            self.has_next = cursor.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor.position is not None
+
+        self.results = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+
+        return Response(payload)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.results:
+            return None
+        return self.encode_cursor(Cursor(self._position(self.results[-1]), False))
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.results:
+            return None
+        return self.encode_cursor(Cursor(self._position(self.results[0]), True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return Cursor(position=None, reverse=False)
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            values = tokens["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError("cursor does not match the ordering")
+
+            position = [
+                self.model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return Cursor(position=position, reverse=bool(tokens.get("r")))
+        except Exception as err:
+            raise NotFound(self.invalid_cursor_message) from err
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor.position}
+        if cursor.reverse:
+            tokens["r"] = 1
+
+        # str()/isoformat() keep full microsecond precision, unlike
+        # DjangoJSONEncoder, so equal timestamps still compare equal
+        raw = json.dumps(tokens, default=_cursor_value, separators=(",", ":"))
+        encoded = urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset cursor; send it empty to start cursor mode.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'approx' to include an estimated count.",
+                "schema": {"type": "string", "enum": ["approx"]},
+            },
+        ]
+
+    def _position(self, instance):
+        return [getattr(instance, field.lstrip("-")) for field in self.ordering]
+
+    def _after(self, ordering, position):
+        # (a, b, c) after (A, B, C): a > A OR (a = A AND b > B) OR ...
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
@@ -0,0 +1,60 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _model_field(model, name):
+    try:
+        field = model._meta.get_field(name)  # also resolves attnames (post_id)
+    except FieldDoesNotExist:
+        return None
+    return field if field.concrete else None
+
+
+def serializer_projection(serializer):
+    """
+    Returns the ``only()`` paths of the model columns serializer reads,
+    following nested serializers and dotted sources over forward relations.
+
+    Sources that are not model columns (annotations, attributes set by the
+    view, properties) are skipped; method fields declare the columns they
+    read in ``Meta.extra_projection``.
+    """
+    model = serializer.Meta.model
+    paths = list(getattr(serializer.Meta, "extra_projection", ()))
+
+    for field in serializer._readable_fields:
+        path, current, model_field = [], model, None
+        for attr in field.source_attrs:  # empty for source="*"
+            model_field = _model_field(current, attr)
+            if model_field is None:
+                break
+            path.append(model_field.name)
+            paths.append("__".join(path))
+            if not model_field.is_relation:
+                break
+            current = model_field.related_model
+        else:
+            nested = isinstance(field, serializers.Serializer)
+            if path and nested and model_field.is_relation:
+                paths.extend(
+                    "__".join([*path, child]) for child in serializer_projection(field)
+                )
+
+    return list(dict.fromkeys(paths))
+
+
+class ProjectedListMixin:
+    """
+    Restricts list querysets, and their select_related joins, to the columns
+    the list serializer reads (plus the keyset ``cursor_ordering`` fields),
+    instead of loading whole rows.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != "GET":
+            return queryset
+
+        paths = serializer_projection(self.get_serializer())
+        paths += [field.lstrip("-") for field in getattr(self, "cursor_ordering", ())]
+        return queryset.only(*paths)
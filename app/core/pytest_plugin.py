@@ -0,0 +1,67 @@
+"""
+pytest plugin enforcing the app.core.budgets query budgets in test runs.
+
+Every request sent through the Django/DRF test clients is metered by
+QueryBudgetMiddleware and fails the test when it goes over its endpoint's
+budget; tests calling views directly use the ``query_budget`` fixture.
+Mark a test with ``no_query_budget`` to opt out.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.budgets import (
+    QueryBudgetExceeded,
+    QueryMeter,
+    budget_for,
+    describe,
+    violations,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-budget-time",
+        action="store_true",
+        help="also enforce the DB time budgets (off by default, timings vary)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "no_query_budget: do not enforce query budgets in this test"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _enforce_query_budgets(request):
+    if request.node.get_closest_marker("no_query_budget"):
+        yield
+        return
+
+    settings = request.getfixturevalue("settings")
+    settings.QUERY_BUDGET_SAMPLE_RATE = 1.0
+    settings.QUERY_BUDGET_RAISE = True
+    settings.QUERY_BUDGET_CHECK_TIME = request.config.getoption("query_budget_time")
+    yield
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    ``with query_budget("v2:posts"): view(request)`` fails the test when the
+    block goes over the budget of that view name and method.
+    """
+    check_time = request.config.getoption("query_budget_time")
+
+    @contextmanager
+    def enforce(view_name, method="GET"):
+        budget = budget_for(view_name, method)
+        with QueryMeter() as meter:
+            yield meter
+        if violations(budget, meter, check_time=check_time):
+            endpoint = f"{method} {view_name}"
+            raise QueryBudgetExceeded(describe(endpoint, budget, meter))
+
+    return enforce
@@ -0,0 +1,26 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def top_k_per_partition(queryset, partition_by, order_by, k, rank="partition_rank"):
+    """
+    Keeps the first k rows of every partition_by group of queryset, ranked by
+    order_by, with a single ``ROW_NUMBER() OVER (PARTITION BY ...)`` query.
+
+    Rows come back grouped by partition and ranked, with the row number
+    annotated as ``rank``.
+    """
+    partition_by = list(partition_by)
+    return (
+        queryset.annotate(
+            **{
+                rank: Window(
+                    RowNumber(),
+                    partition_by=[F(field) for field in partition_by],
+                    order_by=list(order_by),
+                )
+            }
+        )
+        .filter(**{f"{rank}__lte": k})
+        .order_by(*partition_by, rank)
+    )
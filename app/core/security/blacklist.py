@@ -0,0 +1,258 @@
+import hashlib
+import logging
+import math
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEY = "token_blacklist:filter"
+
+# a rebuild taking longer than this lets another worker start one
+REBUILD_LOCK_TIMEOUT = 60
+
+# SETBIT creates missing keys; a filter holding only these bits would answer
+# "no" for every other blacklisted token, so a missing one is left for the
+# next rebuild instead
+SET_BITS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    for _, position in ipairs(ARGV) do
+        redis.call('SETBIT', KEYS[1], position, 1)
+    end
+end
+"""
+
+
+def filter_size(capacity, error_rate):
+    """
+    Returns the (bits, hashes) of a Bloom filter holding capacity items at
+    error_rate false positives.
+    """
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class RedisBits:
+    """
+    The filter's bit array as one Redis string, shared by every worker.
+    """
+
+    def __init__(self, client, key=FILTER_KEY):
+        self.client = client
+        self.key = key
+        self.set_bits = client.register_script(SET_BITS_SCRIPT)
+
+    def get(self, positions):
+        # None when the filter does not exist (GETBIT would read zeros)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.exists(self.key)
+        for position in positions:
+            pipe.getbit(self.key, position)
+        exists, *bits = pipe.execute()
+        return all(bits) if exists else None
+
+    def set(self, positions):
+        self.set_bits(keys=[self.key], args=positions)
+
+    def replace(self, bits):
+        # built under its own key and renamed into place, so checks never see
+        # a half-written filter; the TTL only reaps it if this worker dies
+        # before the RENAME
+        building = f"{self.key}:building:{uuid.uuid4().hex}"
+        self.client.set(building, bytes(bits), ex=REBUILD_LOCK_TIMEOUT)
+        pipe = self.client.pipeline()
+        pipe.rename(building, self.key)
+        pipe.persist(self.key)
+        pipe.execute()
+
+    def clear(self):
+        self.client.delete(self.key)
+
+    def lock(self):
+        return self.client.lock(f"{self.key}:rebuild", timeout=REBUILD_LOCK_TIMEOUT)
+
+
+class LocalBits:
+    """
+    The bit array in process memory, for caches other than Redis.
+    """
+
+    def __init__(self):
+        self.bits = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+    def get(self, positions):
+        bits = self.bits
+        if bits is None:
+            return None
+        return all(bits[p >> 3] & (0x80 >> (p & 7)) for p in positions)
+
+    def set(self, positions):
+        with self._lock:
+            if self.bits is None:
+                return
+            for position in positions:
+                self.bits[position >> 3] |= 0x80 >> (position & 7)
+
+    def replace(self, bits):
+        self.bits = bytearray(bits)
+
+    def clear(self):
+        self.bits = None
+
+    def lock(self):
+        return self._rebuild_lock
+
+
+class BlacklistFilter:
+    """
+    Bloom filter over the jtis of blacklisted tokens: "no" means the token is
+    definitely not blacklisted and needs no query, "maybe" falls through to
+    the BlacklistedToken table.
+
+    Bits are numbered like Redis SETBIT (most significant bit first), so a
+    locally built array can replace the shared one in a single SET.
+    """
+
+    def __init__(self, store, capacity, error_rate):
+        self.store = store
+        self.size, self.hashes = filter_size(capacity, error_rate)
+
+    def positions(self, jti):
+        digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def might_contain(self, jti):
+        positions = self.positions(jti)
+        found = self.store.get(positions)
+        if found is not None:
+            return found
+
+        # one request rebuilds a missing filter; the others answer "maybe"
+        # and query the table until it is back
+        lock = self.store.lock()
+        if not lock.acquire(blocking=False):
+            return True
+        try:
+            found = self.store.get(positions)
+            if found is None:
+                self.rebuild()
+                found = self.store.get(positions)
+        finally:
+            lock.release()
+        # None again if the filter was dropped since the rebuild: still "maybe"
+        return found is not False
+
+    def add(self, jti):
+        self.store.set(self.positions(jti))
+
+    def rebuild(self):
+        """
+        Rebuilds the filter from the unexpired blacklisted tokens, then adds
+        the ones blacklisted while it was being built. blacklisted_at comes
+        from the clock of whichever host blacklisted the token, so the replay
+        reaches back TOKEN_BLACKLIST_FILTER_REPLAY_MARGIN seconds further.
+        """
+        since = timezone.now() - timedelta(
+            seconds=settings.TOKEN_BLACKLIST_FILTER_REPLAY_MARGIN
+        )
+        bits = bytearray(math.ceil(self.size / 8))
+        for jti in blacklisted_jtis():
+            for position in self.positions(jti):
+                bits[position >> 3] |= 0x80 >> (position & 7)
+        self.store.replace(bits)
+
+        for jti in blacklisted_jtis(since=since):
+            self.store.set(self.positions(jti))
+
+
+def blacklisted_jtis(since=None):
+    queryset = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+    if since is not None:
+        queryset = queryset.filter(blacklisted_at__gte=since)
+    return queryset.values_list("token__jti", flat=True).iterator(chunk_size=5000)
+
+
+def prune_expired_tokens(batch_size):
+    """
+    Deletes up to batch_size expired outstanding tokens, and their blacklist
+    entries, and returns how many were deleted.
+    """
+    ids = list(
+        OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if ids:
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+_filter = None
+
+
+def get_filter():
+    """
+    Returns the worker's filter, stored in Redis when the default cache is
+    django-redis and in process memory otherwise. It is built from the
+    database on first use when the store is empty.
+    """
+    global _filter
+    if _filter is None:
+        if settings.CACHES["default"]["BACKEND"] == "django_redis.cache.RedisCache":
+            store = RedisBits(get_redis_connection("default"))
+        else:
+            store = LocalBits()
+        _filter = BlacklistFilter(
+            store,
+            settings.TOKEN_BLACKLIST_FILTER_CAPACITY,
+            settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE,
+        )
+    return _filter
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    RefreshToken that asks the blacklist filter before querying the
+    blacklist tables. If the filter is unavailable it queries them anyway.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        try:
+            if not get_filter().might_contain(jti):
+                return
+        except Exception:
+            logger.warning("Token blacklist filter unavailable", exc_info=True)
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter = get_filter()
+        try:
+            blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        except Exception:
+            # a filter without this token would let it through; drop it so
+            # the next check rebuilds it from the table
+            logger.warning("Token blacklist filter unavailable", exc_info=True)
+            try:
+                blacklist_filter.store.clear()
+            except Exception:
+                logger.error("Token blacklist filter may be stale", exc_info=True)
+        return result
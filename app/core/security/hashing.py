@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from prometheus_client import Counter, Histogram
+from rest_framework.exceptions import Throttled
+
+HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time password hashes waited for a hashing thread",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent computing password hashes",
+)
+
+HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hashes refused because the worker's hashing pool was busy",
+    ["reason"],
+)
+
+
+class PasswordHashingBusy(Throttled):
+    default_detail = "Too many logins in progress, please try again shortly."
+    default_code = "password_hashing_busy"
+
+    def __init__(self):
+        super().__init__(wait=1)
+
+
+class PasswordHashExecutor:
+    """
+    Runs password hashes on at most ``workers`` threads with at most
+    ``queue`` more waiting, so a burst of logins or sign-ups cannot occupy
+    every request thread of a worker. Hashes over that limit, or not started
+    within ``queue_timeout`` seconds, raise PasswordHashingBusy (429).
+    """
+
+    def __init__(self, workers, queue, queue_timeout):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def pool(self):
+        # threads do not survive a fork; every gunicorn worker gets its own
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pool = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hash"
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def run(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            HASH_REJECTED.labels("saturated").inc()
+            raise PasswordHashingBusy()
+
+        submitted = time.perf_counter()
+        started = threading.Event()
+
+        def task():
+            started.set()
+            start = time.perf_counter()
+            HASH_QUEUE_WAIT.observe(start - submitted)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                HASH_DURATION.observe(time.perf_counter() - start)
+
+        try:
+            future = self.pool().submit(task)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda future: self._slots.release())
+
+        if not started.wait(self.queue_timeout) and future.cancel():
+            HASH_REJECTED.labels("timeout").inc()
+            raise PasswordHashingBusy()
+        return future.result()
+
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = PasswordHashExecutor(
+            settings.PASSWORD_HASH_WORKERS,
+            settings.PASSWORD_HASH_QUEUE,
+            settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+        )
+    return _executor
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2PasswordHasher (same algorithm name and hashes) computing through
+    the worker's PasswordHashExecutor. verify() and harden_runtime() go
+    through encode(), so logins, sign-ups and password changes all do.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return get_executor().run(super().encode, password, salt, iterations)
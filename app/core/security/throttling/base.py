@@ -1,7 +1,33 @@
 from rest_framework.throttling import SimpleRateThrottle
 
+from app.core.security.throttling.buckets import get_limiter
 
-class BaseUserOrIPThrottle(SimpleRateThrottle):
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle on a token bucket: ``num_requests`` of burst refilled
+    at ``num_requests / duration`` a second. One atomic check per request
+    instead of reading, trimming and rewriting a list of timestamps.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = get_limiter().consume(
+            self.key, self.num_requests, self.num_requests / self.duration
+        )
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class BaseUserOrIPThrottle(TokenBucketThrottle):
     def get_cache_key(self, request, view):
         if request.user and request.user.is_authenticated:
             ident = f"user_{request.user.id}"
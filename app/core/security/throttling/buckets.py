@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Refills, takes one token and saves the bucket in a single round trip.
+# The clock is Redis' own, so every worker agrees on it; numbers go back as
+# strings because Redis truncates Lua floats to integers.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token buckets shared by every worker, updated atomically by
+    TOKEN_BUCKET_SCRIPT. Each check is one EVALSHA whatever the rate window.
+    """
+
+    def __init__(self, client):
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key, capacity, rate):
+        allowed, wait = self.script(keys=[key], args=[capacity, rate])
+        return bool(allowed), float(wait)
+
+
+class LocalTokenBucket:
+    """
+    The same buckets kept in process memory, for caches other than Redis
+    (tests, local development). Limits are per worker.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._buckets = {}  # key -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        with self._lock:
+            now = self.clock()
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - last) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+
+class TokenBucketLimiter:
+    """
+    Front for a bucket backend with a per-worker deny cache: once the backend
+    reports how long a client has to wait, its requests are refused locally
+    until then, without a round trip. No token can appear earlier, so the
+    short circuit never refuses a request the backend would allow.
+
+    Backend errors fail open, like the cache (IGNORE_EXCEPTIONS).
+    """
+
+    def __init__(self, backend, max_denied=10_000, clock=time.monotonic):
+        self.backend = backend
+        self.max_denied = max_denied
+        self.clock = clock
+        self._denied = {}  # key -> monotonic time the client may retry
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        now = self.clock()
+        with self._lock:
+            retry_at = self._denied.get(key)
+            if retry_at is not None:
+                if retry_at > now:
+                    return False, retry_at - now
+                del self._denied[key]
+
+        try:
+            allowed, wait = self.backend.consume(key, capacity, rate)
+        except Exception:
+            logger.warning("Throttle backend unavailable", exc_info=True)
+            return True, 0.0
+
+        if not allowed:
+            self._deny(key, now + wait, now)
+        return allowed, wait
+
+    def _deny(self, key, retry_at, now):
+        with self._lock:
+            if len(self._denied) >= self.max_denied:
+                self._denied = {k: t for k, t in self._denied.items() if t > now}
+                if len(self._denied) >= self.max_denied:
+                    return  # still full of live entries; rely on the backend
+            self._denied[key] = retry_at
+
+
+_limiter = None
+
+
+def get_limiter():
+    """
+    Returns the worker's limiter, on Redis when the default cache is
+    django-redis and in process memory otherwise.
+    """
+    global _limiter
+    if _limiter is None:
+        if settings.CACHES["default"]["BACKEND"] == "django_redis.cache.RedisCache":
+            backend = RedisTokenBucket(get_redis_connection("default"))
+        else:
+            backend = LocalTokenBucket()
+        _limiter = TokenBucketLimiter(
+            backend, max_denied=settings.THROTTLE_DENY_CACHE_SIZE
+        )
+    return _limiter
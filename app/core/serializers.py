@@ -0,0 +1,101 @@
+from operator import attrgetter
+
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject, RelatedField
+
+# fields whose to_representation() is exactly this builtin
+_BUILTIN_REPRESENTATION = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+}
+
+
+def _identity(instance):
+    return instance
+
+
+def _getter(field, model):
+    """
+    Returns a plain attribute getter for field, or None when its source
+    needs DRF's get_attribute() (dotted sources, callables, relations, and
+    any source of a serializer without Meta.model, which could be a method).
+    """
+    if isinstance(field, RelatedField):
+        # keeps the pk-only optimization, no related object is loaded
+        return None
+    if not field.source_attrs:
+        return _identity
+    if len(field.source_attrs) > 1:
+        return None
+
+    attr = field.source_attrs[0]
+    if model is None or callable(getattr(model, attr, None)):
+        return None
+    return attrgetter(attr)
+
+
+def _representation(field):
+    if isinstance(field, serializers.SerializerMethodField):
+        return getattr(field.parent, field.method_name)
+    if isinstance(field, serializers.Serializer):
+        return compile_serializer(field)
+    if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+    return _BUILTIN_REPRESENTATION.get(type(field), field.to_representation)
+
+
+def compile_serializer(serializer):
+    """
+    Compiles serializer into an ``instance -> dict`` function with the same
+    output as serializer.to_representation(), resolving each field's getter
+    and representation once instead of per row.
+    """
+    if (
+        type(serializer).to_representation
+        is not serializers.Serializer.to_representation
+    ):
+        return serializer.to_representation
+
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    plan = [
+        (field.field_name, _getter(field, model), _representation(field), field)
+        for field in serializer._readable_fields
+    ]
+
+    def to_representation(instance):
+        ret = {}
+        for name, getter, represent, field in plan:
+            try:
+                if getter is None:
+                    attribute = field.get_attribute(instance)
+                else:
+                    try:
+                        attribute = getter(instance)
+                    except AttributeError:
+                        # DRF decides between a default, None and skipping
+                        attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+
+            if isinstance(attribute, PKOnlyObject):
+                ret[name] = None if attribute.pk is None else represent(attribute)
+            else:
+                ret[name] = None if attribute is None else represent(attribute)
+        return ret
+
+    return to_representation
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """
+    Read-only ListSerializer that renders every row through
+    compile_serializer(child), skipping the per-row field machinery of
+    Serializer.to_representation(). Output is identical to ListSerializer.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        represent = compile_serializer(self.child)
+        return [represent(item) for item in iterable]
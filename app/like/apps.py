@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LikeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.like"
+
+    def ready(self):
+        from app.like import signals  # noqa: F401
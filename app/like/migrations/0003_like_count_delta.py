@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 22:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("like", "0002_like_like_target_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LikeCountDelta",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("object_id", models.UUIDField()),
+                ("delta", models.SmallIntegerField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id"],
+                        name="like_delta_target_idx",
+                    )
+                ],
+            },
+        ),
+    ]
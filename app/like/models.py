@@ -3,7 +3,7 @@ import uuid
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
 
 
 # Create your models here.
@@ -25,3 +25,31 @@ class Like(models.Model):
                 name="like_per_post_or_comment_per_user",
             )
         ]
+        indexes = [
+            # GenericRelation joins and counts filter on the liked object
+            models.Index(fields=["content_type", "object_id"], name="like_target_idx")
+        ]
+
+    def save(self, *args, **kwargs):
+        # the like_count receivers run in the same transaction as the insert
+        with transaction.atomic(using=kwargs.get("using")):
+            return super().save(*args, **kwargs)
+
+
+class LikeCountDelta(models.Model):
+    """
+    Append-only journal of pending like_count changes, used when
+    LIKE_COUNT_WRITE_BEHIND is on (see app.like.services.counters).
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+    delta = models.SmallIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id"], name="like_delta_target_idx"
+            )
+        ]
@@ -0,0 +1,153 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+
+from app.like.models import LikeCountDelta
+from app.utils.signals import counters_changed
+
+
+def pending_key(content_type_id, object_id):
+    return f"likes:{content_type_id}:{object_id}:pending"
+
+
+def _add_pending(totals):
+    # the running sum of each row's unflushed deltas, so reads need no SUM
+    # over the journal; a key lost to eviction restarts at 0 and understates
+    # the count until the next flush of that row recomputes it
+    for (content_type_id, object_id), delta in totals.items():
+        key = pending_key(content_type_id, object_id)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass
+
+
+def _recompute_pending(keys):
+    # after a flush the remaining journal is the truth: a key that was
+    # evicted (or missed an update) in between must not be decremented from 0
+    keys = set(keys)
+    if not keys:
+        return
+
+    totals = {
+        (content_type_id, object_id): total
+        for content_type_id, object_id, total in LikeCountDelta.objects.filter(
+            content_type_id__in={key[0] for key in keys},
+            object_id__in={key[1] for key in keys},
+        )
+        .values_list("content_type_id", "object_id")
+        .annotate(total=Sum("delta"))
+        .order_by()
+    }
+    pending = {key: totals.get(key) for key in keys}
+    cache.set_many(
+        {pending_key(*key): total for key, total in pending.items() if total},
+        timeout=None,
+    )
+    cache.delete_many(
+        [pending_key(*key) for key, total in pending.items() if not total]
+    )
+
+
+def record_like_delta(model, object_id, delta):
+    """
+    Applies a like/unlike to the liked row's like_count.
+
+    With LIKE_COUNT_WRITE_BEHIND the change is journaled instead, so a viral
+    post only takes cheap inserts rather than row-locking UPDATEs;
+    flush_like_deltas() applies the journal in batches.
+    """
+    if settings.LIKE_COUNT_WRITE_BEHIND:
+        content_type = ContentType.objects.get_for_model(model)
+        LikeCountDelta.objects.create(
+            content_type=content_type, object_id=object_id, delta=delta
+        )
+        totals = {(content_type.id, object_id): delta}
+        transaction.on_commit(lambda: _add_pending(totals))
+        return
+
+    model.objects.filter(pk=object_id).update(
+        like_count=Greatest(F("like_count") + delta, 0)
+    )
+    counters_changed.send(sender=model, pk=object_id)
+
+
+def buffered_like_count(obj):
+    """
+    Returns obj's like_count including deltas not flushed yet.
+
+    With LIKE_COUNT_WRITE_BEHIND the row is not written by a like, so obj's
+    loaded like_count is topped up with the cached pending sum instead of
+    being read again.
+    """
+    if not settings.LIKE_COUNT_WRITE_BEHIND:
+        obj.refresh_from_db(fields=["like_count"])
+        return obj.like_count
+
+    content_type = ContentType.objects.get_for_model(obj)
+    pending = cache.get(pending_key(content_type.id, obj.pk), 0)
+    return max(obj.like_count + pending, 0)
+
+
+def flush_like_deltas(batch_size=1000):
+    """
+    Applies up to batch_size journaled deltas as one UPDATE per liked row
+    and deletes them in the same transaction, so a crash or restart can
+    neither lose nor double count a delta. Rows locked by a concurrent
+    flusher are skipped, and liked rows are updated in key order so two
+    flushers cannot deadlock on them. Returns the number of journal rows
+    flushed.
+    """
+    with transaction.atomic():
+        rows = list(
+            LikeCountDelta.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "content_type_id", "object_id", "delta")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        totals = defaultdict(int)
+        for _, content_type_id, object_id, delta in rows:
+            totals[(content_type_id, object_id)] += delta
+
+        changed = []
+        for (content_type_id, object_id), delta in sorted(totals.items()):
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is None or delta == 0:
+                continue
+            model.objects.filter(pk=object_id).update(
+                like_count=Greatest(F("like_count") + delta, 0)
+            )
+            changed.append((model, object_id))
+
+        LikeCountDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+        transaction.on_commit(lambda: _recompute_pending(totals))
+
+    for model, object_id in changed:
+        counters_changed.send(sender=model, pk=object_id)
+
+    return len(rows)
+
+
+def discard_like_deltas(model, object_ids):
+    """
+    Deletes the journaled deltas of model's rows object_ids, for callers that
+    recompute like_count from the Like rows.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        ids = list(
+            LikeCountDelta.objects.select_for_update()
+            .filter(content_type=content_type, object_id__in=object_ids)
+            .values_list("id", flat=True)
+        )
+        LikeCountDelta.objects.filter(id__in=ids).delete()
+        keys = [(content_type.id, object_id) for object_id in object_ids]
+        transaction.on_commit(lambda: _recompute_pending(keys))
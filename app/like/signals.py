@@ -0,0 +1,36 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.like.models import Like
+from app.like.services.counters import record_like_delta
+
+
+def _liked_model(like):
+    model = ContentType.objects.get_for_id(like.content_type_id).model_class()
+    if model is None or not hasattr(model, "counter_fields"):
+        return None
+    if "like_count" not in model.counter_fields:
+        return None
+    return model
+
+
+@receiver(post_save, sender=Like, dispatch_uid="like_count_increment")
+def increment_like_count(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+
+    model = _liked_model(instance)
+    if model:
+        record_like_delta(model, instance.object_id, 1)
+
+
+@receiver(post_delete, sender=Like, dispatch_uid="like_count_decrement")
+def decrement_like_count(sender, instance, origin=None, **kwargs):
+    # the liked object itself is being deleted, nothing left to update
+    if getattr(origin, "pk", None) == instance.object_id:
+        return
+
+    model = _liked_model(instance)
+    if model:
+        record_like_delta(model, instance.object_id, -1)
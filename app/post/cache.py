@@ -0,0 +1,109 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+POST_LIST_VERSION_KEY = "posts:list:version"
+
+
+def post_version_key(post_id):
+    return f"posts:{post_id}:version"
+
+
+def get_versions(*keys):
+    """
+    Returns the current version token of every key, creating missing ones.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*keys):
+    """
+    get_versions() for async views.
+    """
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*keys):
+    """
+    Invalidates every response cached under the given version keys.
+
+    Bumped right away and again once the transaction commits, so a reader
+    that re-cached the old rows before the commit is invalidated as well.
+    """
+
+    def bump():
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def auth_scope(request):
+    # only anonymous responses are shared; authenticated ones carry drafts
+    # and per-user "liked" flags
+    if request.user and request.user.is_authenticated:
+        return None
+    return "anon"
+
+
+def response_cache_key(request, prefix, scope, versions):
+    query = sorted(request.query_params.lists())
+    raw_key = f"{request.get_host()}|{request.path}|{query}|{scope}|{versions}"
+    return f"{prefix}:{hashlib.sha256(raw_key.encode()).hexdigest()}"
+
+
+def cached_response(request, prefix, version_keys, build):
+    """
+    Read-through cache for GET responses, keyed on the path, the query
+    string (filters, page, cursor), the auth scope and the version tokens.
+    """
+    scope = auth_scope(request)
+    if scope is None:
+        return build()
+
+    versions = get_versions(*version_keys)
+    key = response_cache_key(request, prefix, scope, versions)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return Response(cached)
+
+    response = build()
+    if response.status_code == 200:
+        cache.set(key, response.data, timeout=settings.POST_CACHE_TIMEOUT)
+    return response
+
+
+async def acached_response(request, prefix, version_keys, build):
+    """
+    cached_response() for async views; build is a coroutine function.
+    """
+    scope = auth_scope(request)
+    if scope is None:
+        return await build()
+
+    versions = await aget_versions(*version_keys)
+    key = response_cache_key(request, prefix, scope, versions)
+
+    cached = await cache.aget(key)
+    if cached is not None:
+        return Response(cached)
+
+    response = await build()
+    if response.status_code == 200:
+        await cache.aset(key, response.data, timeout=settings.POST_CACHE_TIMEOUT)
+    return response
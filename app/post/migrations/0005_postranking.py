@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-17 22:55
+
+import heapq
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def rank_existing_posts(apps, schema_editor):
+    Post = apps.get_model("post", "Post")
+    PostRanking = apps.get_model("post", "PostRanking")
+
+    reference = timezone.now()
+    scored = []
+    for post_id, likes, comments, created_at in Post.objects.filter(
+        is_published=True
+    ).values_list("id", "like_count", "comment_count", "created_at"):
+        points = likes + settings.POPULAR_POSTS_COMMENT_WEIGHT * comments
+        age_hours = max((reference - created_at).total_seconds(), 0) / 3600
+        score = points / (age_hours + 2) ** settings.POPULAR_POSTS_GRAVITY
+        scored.append((score, post_id))
+
+    PostRanking.objects.bulk_create(
+        PostRanking(post_id=post_id, score=score, scored_at=reference)
+        for score, post_id in heapq.nlargest(settings.POPULAR_POSTS_KEEP, scored)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0004_alter_post_author_post_post_published_created_idx_and_more"),
+        # like_count/comment_count are backfilled there
+        ("comment", "0002_comment_like_count_comment_reply_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostRanking",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ranking",
+                        serialize=False,
+                        to="post.post",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("scored_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["-score"], name="post_ranking_score_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(rank_existing_posts, migrations.RunPython.noop),
+    ]
@@ -5,16 +5,18 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 
 from app.like.models import Like
+from app.utils.models import CounterCacheMixin, ExcerptMixin
 
 
 # Create your models here.
-class Post(models.Model):
+class Post(ExcerptMixin, CounterCacheMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="posts",
         error_messages={"required": "author field is required"},
+        db_index=False,  # covered by post_author_status_idx
     )
     title = models.CharField(
         max_length=100,
@@ -33,15 +35,61 @@ class Post(models.Model):
         },
     )
     is_published = models.BooleanField(default=False)
+    # first words of content, maintained by ExcerptMixin
+    excerpt = models.TextField(blank=True, editable=False)
+
+    # Denormalized counters, maintained by app.like.signals/app.comment.signals
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     # Polymorhpic Relation with Like. Reverse relation with child
     likes = GenericRelation(Like, related_query_name="likes")
 
+    counter_fields = ("like_count", "comment_count")
+
+    class Meta:
+        indexes = [
+            # default feed: published posts, newest first (keyset: created_at, id)
+            models.Index(
+                fields=["-created_at", "id"],
+                condition=models.Q(is_published=True),
+                name="post_published_created_idx",
+            ),
+            # ?author=me / ?status=draft|all, and the staff feed
+            models.Index(
+                fields=["author", "is_published", "-created_at"],
+                name="post_author_status_idx",
+            ),
+            models.Index(fields=["-created_at", "id"], name="post_created_idx"),
+            # popular posts
+            models.Index(
+                fields=["-like_count", "-created_at"], name="post_popular_idx"
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         self.full_clean()
         return super().save(*args, **kwargs)
 
     def __str__(self):
-        return self.author.full_name
+        # not the author: that would cost a query per post in any listing
+        return self.title
+
+
+class PostRanking(models.Model):
+    """
+    Materialized popular-posts ranking, see app.post.ranking.
+    """
+
+    post = models.OneToOneField(
+        Post, primary_key=True, on_delete=models.CASCADE, related_name="ranking"
+    )
+    score = models.FloatField()
+    # reference time the score's age was measured against
+    scored_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["-score"], name="post_ranking_score_idx")]
@@ -0,0 +1,104 @@
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.post.models import Post, PostRanking
+
+
+def hot_score(like_count, comment_count, created_at, reference):
+    """
+    Hacker News style time-decayed score: points / (age_hours + 2) ^ gravity.
+
+    The age is measured against a shared reference time instead of "now" so
+    that scores written by incremental updates stay comparable with the ones
+    written by the last rebuild.
+    """
+    points = like_count + settings.POPULAR_POSTS_COMMENT_WEIGHT * comment_count
+    age_hours = max((reference - created_at).total_seconds(), 0) / 3600
+    return points / (age_hours + 2) ** settings.POPULAR_POSTS_GRAVITY
+
+
+def current_reference():
+    reference = (
+        PostRanking.objects.order_by("-scored_at")
+        .values_list("scored_at", flat=True)
+        .first()
+    )
+    return reference or timezone.now()
+
+
+def refresh_post(post_id):
+    """
+    Re-scores a single post after a like/comment/publish event. A post not
+    ranked yet only enters the table if it beats the POPULAR_POSTS_KEEP-th
+    score, which then drops the lowest rows.
+    """
+    post = (
+        Post.objects.filter(pk=post_id, is_published=True)
+        .values("like_count", "comment_count", "created_at")
+        .first()
+    )
+    if post is None:
+        PostRanking.objects.filter(post_id=post_id).delete()
+        return
+
+    reference = current_reference()
+    score = hot_score(**post, reference=reference)
+    keep = settings.POPULAR_POSTS_KEEP
+    ranked = PostRanking.objects.order_by("-score")
+
+    with transaction.atomic():
+        if PostRanking.objects.filter(post_id=post_id).update(
+            score=score, scored_at=reference
+        ):
+            return
+        if keep <= 0:
+            return
+
+        last = keep - 1
+        lowest = ranked.values_list("score", flat=True)[last:keep].first()
+        if lowest is not None and score <= lowest:
+            return
+
+        # a concurrent refresh of the same post may have inserted it first
+        PostRanking.objects.bulk_create(
+            [PostRanking(post_id=post_id, score=score, scored_at=reference)],
+            ignore_conflicts=True,
+        )
+        surplus = list(ranked.values_list("post_id", flat=True)[keep:])
+        if surplus:
+            PostRanking.objects.filter(post_id__in=surplus).delete()
+
+
+def rebuild_ranking(keep=None):
+    """
+    Re-scores every published post at the current time and keeps the top
+    ``keep`` rows. Returns the number of rows written.
+    """
+    if keep is None:
+        keep = settings.POPULAR_POSTS_KEEP
+    reference = timezone.now()
+
+    rows = (
+        Post.objects.filter(is_published=True)
+        .values_list("id", "like_count", "comment_count", "created_at")
+        .iterator(chunk_size=2000)
+    )
+    top = heapq.nlargest(
+        keep,
+        (
+            (hot_score(likes, comments, created_at, reference), post_id)
+            for post_id, likes, comments, created_at in rows
+        ),
+    )
+
+    with transaction.atomic():
+        PostRanking.objects.all().delete()
+        PostRanking.objects.bulk_create(
+            PostRanking(post_id=post_id, score=score, scored_at=reference)
+            for score, post_id in top
+        )
+
+    return len(top)
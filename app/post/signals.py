@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.post.cache import POST_LIST_VERSION_KEY, bump_versions, post_version_key
+from app.post.models import Post
+from app.post.ranking import refresh_post
+from app.utils.signals import counters_changed
+
+
+@receiver(post_save, sender=Post, dispatch_uid="post_cache_on_save")
+@receiver(post_delete, sender=Post, dispatch_uid="post_cache_on_delete")
+def invalidate_post(sender, instance, **kwargs):
+    bump_versions(POST_LIST_VERSION_KEY, post_version_key(instance.pk))
+
+
+@receiver(post_save, sender="comment.Comment", dispatch_uid="post_cache_comment_save")
+@receiver(
+    post_delete, sender="comment.Comment", dispatch_uid="post_cache_comment_delete"
+)
+def invalidate_commented_post(sender, instance, origin=None, **kwargs):
+    # a cascade from the post itself is already covered by invalidate_post
+    if getattr(origin, "pk", None) == instance.post_id:
+        return
+
+    # comment_count on the lists, top_comments on the detail
+    bump_versions(POST_LIST_VERSION_KEY, post_version_key(instance.post_id))
+
+
+@receiver(post_save, sender=Post, dispatch_uid="post_ranking_on_save")
+def rank_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_post(instance.pk)
+
+
+@receiver(counters_changed, sender=Post, dispatch_uid="post_counters_changed")
+def refresh_engaged_post(sender, pk, **kwargs):
+    bump_versions(POST_LIST_VERSION_KEY, post_version_key(pk))
+    refresh_post(pk)
+
+
+@receiver(
+    counters_changed, sender="comment.Comment", dispatch_uid="comment_counters_changed"
+)
+def invalidate_engaged_comment(sender, pk, **kwargs):
+    # comment counters only show up in the post detail's top_comments
+    post_id = sender.objects.filter(pk=pk).values_list("post_id", flat=True).first()
+    if post_id:
+        bump_versions(post_version_key(post_id))
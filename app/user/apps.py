@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.user"
+
+    def ready(self):
+        from app.user import signals  # noqa: F401
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# the password hash stays out of the cache; it is loaded on access
+CACHED_EXCLUDE = {"password"}
+
+
+def user_cache_key(user_id):
+    return f"users:{user_id}:auth"
+
+
+def _cached_fields(model):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname not in CACHED_EXCLUDE
+    ]
+
+
+def get_cached_user(user_id):
+    """
+    Returns the user with pk user_id from the cache, loading and caching it
+    for USER_CACHE_TIMEOUT seconds on a miss. Raises DoesNotExist.
+    """
+    model = get_user_model()
+    fields = _cached_fields(model)
+    key = user_cache_key(user_id)
+
+    values = cache.get(key)
+    if values is None:
+        values = model.objects.values_list(*fields).get(pk=user_id)
+        cache.set(key, values, timeout=settings.USER_CACHE_TIMEOUT)
+
+    return model.from_db(DEFAULT_DB_ALIAS, fields, values)
+
+
+def invalidate_user(user_id):
+    """
+    Drops the cached user right away and again once the transaction commits,
+    so a request that re-cached the old row in between is dropped as well.
+    """
+    key = user_cache_key(user_id)
+
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
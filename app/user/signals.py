@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.user.cache import invalidate_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="user_cache_on_save")
+@receiver(
+    post_delete, sender=settings.AUTH_USER_MODEL, dispatch_uid="user_cache_on_delete"
+)
+def invalidate_saved_user(sender, instance, **kwargs):
+    # covers disable/enable, password changes and admin edits
+    invalidate_user(instance.pk)
@@ -0,0 +1,74 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from app.like.models import Like
+from app.like.services.counters import buffered_like_count, flush_like_deltas
+from app.post.models import Post
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare synchronous and write-behind like counting on one hot post "
+        "(runs in a transaction that is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--likes", type=int, default=500, help="Likes per mode (default: 500)"
+        )
+
+    def handle(self, *args, **options):
+        for write_behind in (False, True):
+            label = "write-behind" if write_behind else "synchronous"
+            with override_settings(LIKE_COUNT_WRITE_BEHIND=write_behind):
+                elapsed, flush, count = self._run(options["likes"])
+            per_like = elapsed / options["likes"] * 1000
+            self.stdout.write(
+                f"{label:>13}: {per_like:.3f} ms/like, "
+                f"flush {flush * 1000:.1f} ms, like_count={count}"
+            )
+
+    def _run(self, likes):
+        result = None
+        try:
+            with transaction.atomic():
+                author = get_user_model().objects.create_user(
+                    full_name="bench", email="bench-author@example.com", password="x"
+                )
+                post = Post.objects.create(
+                    author=author, title="bench", content="bench", is_published=True
+                )
+                users = get_user_model().objects.bulk_create(
+                    get_user_model()(full_name="bench", email=f"bench-{i}@example.com")
+                    for i in range(likes)
+                )
+                content_type = ContentType.objects.get_for_model(Post)
+
+                start = time.perf_counter()
+                for user in users:
+                    Like.objects.get_or_create(
+                        user=user, content_type=content_type, object_id=post.id
+                    )
+                    buffered_like_count(post)
+                elapsed = time.perf_counter() - start
+
+                start = time.perf_counter()
+                while flush_like_deltas():
+                    pass
+                flush = time.perf_counter() - start
+
+                post.refresh_from_db(fields=["like_count"])
+                result = (elapsed, flush, post.like_count)
+                raise _Rollback
+        except _Rollback:
+            pass
+        return result
@@ -0,0 +1,64 @@
+import timeit
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.v2.post.serializer import PostListSerializer
+from app.core.renderers import ORJSONRenderer
+from app.post.models import Post
+from app.utils.text import make_excerpt
+
+
+class Command(BaseCommand):
+    help = "Compare JSON render time of a PostListSerializer page per renderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items", type=int, default=100, help="Posts per page (default: 100)"
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=200, help="Renders per renderer"
+        )
+
+    def handle(self, *args, **options):
+        data = {
+            "count": options["items"],
+            "next": None,
+            "previous": None,
+            "results": PostListSerializer(self._page(options["items"]), many=True).data,
+        }
+
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            elapsed = timeit.timeit(
+                lambda renderer=renderer: renderer.render(data),
+                number=options["rounds"],
+            )
+            per_page = elapsed / options["rounds"] * 1000
+            self.stdout.write(
+                f"{type(renderer).__name__:>14}: {per_page:.3f} ms/page, "
+                f"{len(renderer.render(data))} bytes"
+            )
+
+    def _page(self, items):
+        # unsaved instances: only rendering is measured, not the database
+        author = get_user_model()(id=uuid.uuid4(), full_name="Benchmark Author")
+        now = timezone.now()
+        page = []
+        for i in range(items):
+            post = Post(
+                id=uuid.uuid4(),
+                author=author,
+                title=f"Benchmark post {i}",
+                content="lorem ipsum dolor sit amet " * 20,
+                excerpt=make_excerpt("lorem ipsum dolor sit amet " * 20),
+                is_published=True,
+                like_count=i,
+                comment_count=i // 2,
+                created_at=now,
+            )
+            post.liked = bool(i % 2)
+            page.append(post)
+        return page
@@ -0,0 +1,83 @@
+import timeit
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.v2.comment.serializer import CommentListSerializer, ReplyListSerializer
+from api.v2.post.serializer import PostListSerializer, TopCommentListSerializer
+from app.comment.models import Comment
+from app.post.models import Post
+from app.utils.text import make_excerpt
+
+
+class Command(BaseCommand):
+    help = "Compare per-row cost of the compiled and stock list serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items", type=int, default=100, help="Rows per page (default: 100)"
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=50, help="Pages serialized per run"
+        )
+
+    def handle(self, *args, **options):
+        items, rounds = options["items"], options["rounds"]
+        posts, comments = self._rows(items)
+
+        for serializer_class, rows in (
+            (PostListSerializer, posts),
+            (TopCommentListSerializer, comments),
+            (CommentListSerializer, comments),
+            (ReplyListSerializer, comments),
+        ):
+            stock = timeit.timeit(
+                lambda: serializers.ListSerializer(rows, child=serializer_class()).data,
+                number=rounds,
+            )
+            compiled = timeit.timeit(
+                lambda: serializer_class(rows, many=True).data, number=rounds
+            )
+            per_row = 1_000_000 / (items * rounds)
+            self.stdout.write(
+                f"{serializer_class.__name__:>24}: "
+                f"stock {stock * per_row:.1f} µs/row, "
+                f"compiled {compiled * per_row:.1f} µs/row"
+            )
+
+    def _rows(self, items):
+        # unsaved instances: only serialization is measured, not the database
+        author = get_user_model()(id=uuid.uuid4(), full_name="Benchmark Author")
+        now = timezone.now()
+        content = "lorem ipsum dolor sit amet " * 10
+
+        posts, comments = [], []
+        for i in range(items):
+            post = Post(
+                id=uuid.uuid4(),
+                author=author,
+                title=f"Benchmark post {i}",
+                content=content,
+                excerpt=make_excerpt(content),
+                is_published=True,
+                like_count=i,
+                comment_count=i // 2,
+                created_at=now,
+            )
+            comment = Comment(
+                id=uuid.uuid4(),
+                author=author,
+                post=post,
+                content=content,
+                excerpt=make_excerpt(content),
+                like_count=i,
+                reply_count=i // 3,
+                created_at=now,
+            )
+            post.liked = comment.liked = bool(i % 2)
+            posts.append(post)
+            comments.append(comment)
+        return posts, comments
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import SimpleRateThrottle
+
+from app.core.security.throttling.base import BaseUserOrIPThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-request cost of DRF's timestamp-list throttle and the "
+        "token bucket throttle as the rate window grows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--windows",
+            type=int,
+            nargs="+",
+            default=[100, 1000, 10000],
+            help="Requests allowed per hour (default: 100 1000 10000)",
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=50, help="Timed checks per window"
+        )
+
+    def handle(self, *args, **options):
+        throttles = {
+            "timestamp list": SimpleRateThrottle,
+            "token bucket": BaseUserOrIPThrottle,
+        }
+        for number, window in enumerate(options["windows"]):
+            for label, base in throttles.items():
+                throttle_class = type(
+                    "BenchmarkThrottle",
+                    (base,),
+                    {
+                        "rate": f"{window}/h",
+                        "scope": "benchmark",
+                        "get_cache_key": BaseUserOrIPThrottle.get_cache_key,
+                    },
+                )
+                request = Request(
+                    RequestFactory().get("/", REMOTE_ADDR=f"10.0.{number}.1")
+                )
+                per_check = self._run(
+                    throttle_class, request, window, options["rounds"]
+                )
+                self.stdout.write(
+                    f"{window:>6}/h {label:>14}: {per_check * 1000:.3f} ms/request"
+                )
+
+    def _run(self, throttle_class, request, window, rounds):
+        # half full, so every timed request is still allowed and written back
+        for _ in range(window // 2):
+            throttle_class().allow_request(request, None)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            assert throttle_class().allow_request(request, None)
+        return (time.perf_counter() - start) / rounds
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.like.services.counters import flush_like_deltas
+
+
+class Command(BaseCommand):
+    help = "Apply journaled like/unlike deltas to the like_count columns"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.LIKE_COUNT_FLUSH_BATCH_SIZE,
+            help="Deltas applied per transaction (default: LIKE_COUNT_FLUSH_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and flush every N seconds (default: flush once)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = 0
+            while True:
+                batch = flush_like_deltas(batch_size=options["batch_size"])
+                flushed += batch
+                if batch < options["batch_size"]:
+                    break
+
+            self.stdout.write(self.style.SUCCESS(f"✅ Flushed {flushed} like deltas"))
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)  # the chunk and its CRLF
+            if size == 0:
+                return
+    await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def _get(reader, writer, host, path, extra_headers):
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{extra_headers}\r\n".encode("latin-1")
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by the server")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await _read_body(reader, headers)
+    return status, headers.get("connection", "").lower() == "close"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the hot read endpoints of one or more running deployments "
+        "(e.g. SERVER_MODE=wsgi and asgi) with concurrent keep-alive clients "
+        "and compare their latency percentiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            metavar="NAME=URL",
+            help="Deployment to test, e.g. wsgi=http://localhost:3000 (repeatable)",
+        )
+        parser.add_argument(
+            "--clients", type=int, default=200, help="Concurrent clients (default: 200)"
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds per target (default: 30)",
+        )
+        parser.add_argument(
+            "--warmup", type=float, default=5, help="Untimed seconds first (default: 5)"
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            help="Path to request (repeatable); defaults to the post list, a post, "
+            "its comments and a comment's replies",
+        )
+        parser.add_argument(
+            "--token",
+            help="Bearer access token; authenticated reads skip the response cache",
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, _, url = target.partition("=")
+            if not url:
+                raise CommandError(f"--target must be NAME=URL, got {target!r}")
+            targets.append((name, url.rstrip("/")))
+
+        extra_headers = "Accept: application/json\r\n"
+        if options["token"]:
+            extra_headers += f"Authorization: Bearer {options['token']}\r\n"
+
+        paths = options["path"] or self._discover_paths(targets[0][1])
+        self.stdout.write(f"{options['clients']} clients over: {', '.join(paths)}")
+        self.stdout.write(
+            f"{'target':>8} {'requests':>9} {'errors':>7} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+
+        clients = options["clients"]
+        for name, url in targets:
+            asyncio.run(
+                self._load(url, paths, extra_headers, clients, options["warmup"])
+            )
+            latencies, errors = asyncio.run(
+                self._load(url, paths, extra_headers, clients, options["duration"])
+            )
+            if not latencies:
+                raise CommandError(f"{name}: no successful requests")
+
+            ordered = sorted(latencies)
+            rate = len(ordered) / options["duration"]
+            timings = " ".join(
+                f"{percentile(ordered, fraction) * 1000:>8.1f}"
+                for fraction in (0.5, 0.95, 0.99, 1.0)
+            )
+            self.stdout.write(
+                f"{name:>8} {len(ordered):>9} {errors:>7} {rate:>8.1f} {timings}"
+            )
+
+    def _discover_paths(self, url):
+        def first_id(path):
+            with urlopen(url + path, timeout=10) as response:
+                results = json.load(response)["results"]
+            return results[0]["id"] if results else None
+
+        paths = [reverse("v2:posts")]
+        post_id = first_id(paths[0])
+        if post_id is None:
+            raise CommandError("no published posts to load test; pass --path")
+
+        paths.append(reverse("v2:post-detail", args=[post_id]))
+        paths.append(reverse("v2:comments", args=[post_id]))
+        comment_id = first_id(paths[-1])
+        if comment_id is not None:
+            paths.append(reverse("v2:replies", args=[comment_id]))
+        return paths
+
+    async def _load(self, url, paths, extra_headers, clients, duration):
+        deadline = time.perf_counter() + duration
+        results = await asyncio.gather(
+            *(
+                self._client(url, paths, extra_headers, offset, deadline)
+                for offset in range(clients)
+            )
+        )
+        latencies = [latency for client, _ in results for latency in client]
+        return latencies, sum(errors for _, errors in results)
+
+    async def _client(self, url, paths, extra_headers, offset, deadline):
+        # one keep-alive connection per client, reopened after errors
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        ssl = parts.scheme == "https"
+        latencies, errors, connection = [], 0, None
+
+        number = offset
+        while time.perf_counter() < deadline:
+            path = paths[number % len(paths)]
+            number += 1
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(
+                        parts.hostname, port, ssl=ssl
+                    )
+                status, close = await _get(
+                    *connection, parts.netloc, path, extra_headers
+                )
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                errors += 1
+                close = True
+                await asyncio.sleep(0.05)  # do not spin on a refused connection
+            else:
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+            if close and connection is not None:
+                connection[1].close()
+                connection = None
+
+        if connection is not None:
+            connection[1].close()
+        return latencies, errors
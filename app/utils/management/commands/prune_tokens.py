@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.core.security.blacklist import get_filter, prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in batches, "
+        "then rebuild the blacklist filter"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tokens deleted per batch (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        pruned = 0
+        while True:
+            batch = prune_expired_tokens(batch_size=options["batch_size"])
+            pruned += batch
+            if batch < options["batch_size"]:
+                break
+
+        get_filter().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"✅ Pruned {pruned} expired tokens"))
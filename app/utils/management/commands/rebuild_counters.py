@@ -0,0 +1,106 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from app.comment.models import Comment
+from app.like.models import Like
+from app.like.services.counters import discard_like_deltas, flush_like_deltas
+from app.post.models import Post
+
+
+def _count_subquery(queryset, group_by):
+    counted = (
+        queryset.order_by().values(group_by).annotate(total=Count("pk")).values("total")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def expected_post_counters():
+    return {
+        "like_count": _count_subquery(
+            Like.objects.filter(
+                content_type=ContentType.objects.get_for_model(Post),
+                object_id=OuterRef("pk"),
+            ),
+            "object_id",
+        ),
+        "comment_count": _count_subquery(
+            Comment.objects.filter(post=OuterRef("pk"), parent__isnull=True), "post"
+        ),
+    }
+
+
+def expected_comment_counters():
+    return {
+        "like_count": _count_subquery(
+            Like.objects.filter(
+                content_type=ContentType.objects.get_for_model(Comment),
+                object_id=OuterRef("pk"),
+            ),
+            "object_id",
+        ),
+        "reply_count": _count_subquery(
+            Comment.objects.filter(parent=OuterRef("pk")), "parent"
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized like/comment/reply counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows repaired per UPDATE (defaults: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows have drifted",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        if not dry_run:
+            # apply the write-behind journal first so pending deltas are not
+            # reported as drift
+            while flush_like_deltas(batch_size=batch_size):
+                pass
+
+        for model, expected in (
+            (Post, expected_post_counters()),
+            (Comment, expected_comment_counters()),
+        ):
+            drifted = self._drifted_pks(model, expected)
+            name = model._meta.verbose_name_plural
+
+            if dry_run:
+                self.stdout.write(f"{len(drifted)} {name} with drifted counters")
+                continue
+
+            for start in range(0, len(drifted), batch_size):
+                end = start + batch_size
+                batch = drifted[start:end]
+                with transaction.atomic():
+                    # deltas journaled since the flush are counted from the
+                    # Like rows below; left in place they would be applied
+                    # again by the next flush
+                    discard_like_deltas(model, batch)
+                    model.objects.filter(pk__in=batch).update(**expected)
+
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Repaired counters on {len(drifted)} {name}")
+            )
+
+    def _drifted_pks(self, model, expected):
+        # exclude() with several lookups keeps rows where ANY counter differs
+        qs = model.objects.annotate(
+            **{f"expected_{field}": value for field, value in expected.items()}
+        ).exclude(**{field: F(f"expected_{field}") for field in expected})
+        return list(qs.values_list("pk", flat=True))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from app.comment.models import Comment
+from app.post.models import Post
+from app.utils.text import make_excerpt
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored post and comment excerpts from their content"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows written per UPDATE (defaults: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows have a stale excerpt",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        for model in (Post, Comment):
+            count, stale = 0, []
+            rows = model.objects.only("pk", "content", "excerpt")
+            for row in rows.iterator(chunk_size=batch_size):
+                excerpt = make_excerpt(row.content)
+                if row.excerpt != excerpt:
+                    row.excerpt = excerpt
+                    stale.append(row)
+                if len(stale) >= batch_size:
+                    count += self._save(model, stale, dry_run)
+                    stale = []
+            count += self._save(model, stale, dry_run)
+
+            name = model._meta.verbose_name_plural
+            if dry_run:
+                self.stdout.write(f"{count} {name} with stale excerpts")
+                continue
+
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Rebuilt excerpts on {count} {name}")
+            )
+
+    def _save(self, model, stale, dry_run):
+        # bulk_update: save() would rewrite every column and updated_at
+        if stale and not dry_run:
+            model.objects.bulk_update(stale, ["excerpt"])
+        return len(stale)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.post.ranking import rebuild_ranking
+
+
+class Command(BaseCommand):
+    help = "Re-score published posts and rebuild the popular posts ranking"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=settings.POPULAR_POSTS_KEEP,
+            help="Number of ranked posts to keep (defaults: POPULAR_POSTS_KEEP)",
+        )
+
+    def handle(self, *args, **options):
+        ranked = rebuild_ranking(keep=options["keep"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Ranked {ranked} posts"))
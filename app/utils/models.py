@@ -1 +1,44 @@
-# Create your models here.
+from django.db import transaction
+
+from app.utils.text import make_excerpt
+
+
+class CounterCacheMixin:
+    """
+    Guards denormalized counter columns against lost updates.
+
+    Counters are only ever changed through atomic ``F()`` updates issued by
+    signal receivers, so a regular ``save()`` of an existing row must never
+    write back the (possibly stale) in-memory values.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+
+        # keep the row write and the counter updates of its receivers together
+        with transaction.atomic(using=kwargs.get("using")):
+            return super().save(*args, **kwargs)
+
+
+class ExcerptMixin:
+    """
+    Keeps the stored ``excerpt`` in sync with ``content``, so list pages can
+    serve it and defer the full body.
+    """
+
+    def save(self, *args, **kwargs):
+        if "content" not in self.get_deferred_fields():
+            self.excerpt = make_excerpt(self.content)
+
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+
+        return super().save(*args, **kwargs)
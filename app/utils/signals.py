@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent with sender=<model class> and pk=<row pk> once one of the row's
+# denormalized counters (see CounterCacheMixin) has been updated.
+counters_changed = Signal()
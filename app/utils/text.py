@@ -0,0 +1,13 @@
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 30
+
+
+def make_excerpt(text, words=EXCERPT_WORDS):
+    """
+    Returns text unchanged when it has at most ``words`` words, otherwise its
+    first ``words`` words followed by " ...".
+    """
+    if len(text.split()) <= words:
+        return text
+    return Truncator(text).words(words, truncate=" ...")
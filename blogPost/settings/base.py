@@ -16,6 +16,15 @@ env = environ.Env(
     ALLOWED_HOSTS=(list, ["localhost"]),
     LOG_SAMPLING_RATE=(float, 0.1),
     PROMETHEUS_TOKEN=(str, ""),
+    REDIS_URL=(str, "redis://redis:6379/1"),
+    POST_CACHE_TIMEOUT=(int, 300),
+    LIKE_COUNT_WRITE_BEHIND=(bool, False),
+    QUERY_BUDGET_SAMPLE_RATE=(float, 0.0),
+    API_PHASE_TIMING=(bool, True),
+    LOG_ROTATE_WHEN=(str, ""),
+    PROMETHEUS_MULTIPROC_DIR=(str, ""),
+    SERVER_MODE=(str, "wsgi"),
+    WEB_THREADS=(int, 4),
 )
 
 # read the .env file
@@ -30,10 +39,23 @@ ALLOWED_HOSTS = env("ALLOWED_HOSTS")
 DEBUG = env("DEBUG")
 LOG_SAMPLING_RATE = max(0, min(1, env("LOG_SAMPLING_RATE")))
 LOG_SAMPLING = not DEBUG
+# successful reads are logged for LOG_SAMPLING_RATE of request ids, at most
+# LOG_SAMPLING_MAX_PER_SECOND per route and worker (so under load a sampled
+# id can be logged by one worker and not another); reads above the
+# route's LOG_SLOW_PERCENTILE latency (over its last LOG_SLOW_WINDOW) always
+LOG_SAMPLING_MAX_PER_SECOND = 10
+LOG_SLOW_PERCENTILE = 0.99
+LOG_SLOW_WINDOW = 1000
+LOG_SLOW_MIN_SAMPLES = 100
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 PROMETHEUS_SCRAPE_TOKEN = env("PROMETHEUS_TOKEN")
 PROMETHEUS_TOKEN_FILE = "/run/secrets/prometheus_scrape_token"
+# distinct route labels per worker; later routes are counted as "other"
+PROMETHEUS_MAX_ENDPOINTS = 200
+# set for gunicorn: prometheus_client reads the same variable at import time
+# and every worker writes its samples there (see gunicorn.conf.py)
+PROMETHEUS_MULTIPROC_DIR = env("PROMETHEUS_MULTIPROC_DIR")
 TESTING = env("TESTING")
 
 # retrieve prometheus token
@@ -75,6 +97,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "app.core.middleware.monitoring.middleware.PrometheusMiddleware",
+    "app.core.middleware.budgets.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -111,20 +134,20 @@ else:
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "app.core.security.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "app.core.parsers.ORJSONParser",
     ],
     "DEFAULT_RENDERER_CLASSES": (
-        ["rest_framework.renderers.JSONRenderer"]
+        ["app.core.renderers.ORJSONRenderer"]
         if not DEBUG
         else [
-            "rest_framework.renderers.JSONRenderer",
+            "app.core.renderers.ORJSONRenderer",
             "rest_framework.renderers.BrowsableAPIRenderer",
         ]
     ),
@@ -135,6 +158,9 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_RATES": DEFAULT_THROTTLE_RATES,
 }
 
+# clients refused by the throttle, remembered per worker until they may retry
+THROTTLE_DENY_CACHE_SIZE = 10_000
+
 
 TEMPLATES = [
     {
@@ -161,15 +187,71 @@ if env("TESTING"):
     PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 else:
     DATABASES = {"default": env.db()}  # reads all in the .env
+    # Django's defaults, with PBKDF2 computed on a bounded pool per worker
+    PASSWORD_HASHERS = [
+        "app.core.security.hashing.PooledPBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.Argon2PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ]
+
+# request threads per gunicorn worker (gunicorn.conf.py reads the same
+# variable). Password hashes running at once per worker and hashes allowed
+# to wait for them (and for how long, in seconds) together stay below it, so
+# a login storm gets 429s while other requests still find a free thread
+WEB_THREADS = max(1, env("WEB_THREADS"))
+PASSWORD_HASH_WORKERS = max(1, WEB_THREADS // 2)
+PASSWORD_HASH_QUEUE = max(0, WEB_THREADS - PASSWORD_HASH_WORKERS - 1)
+PASSWORD_HASH_QUEUE_TIMEOUT = 2.0
+
+
+if TESTING:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": env("REDIS_URL"),
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # a Redis outage degrades to cache misses, not 500s
+                "IGNORE_EXCEPTIONS": True,
+            },
+        }
+    }
+
+# read-through cache of anonymous post list/detail responses (seconds)
+POST_CACHE_TIMEOUT = env("POST_CACHE_TIMEOUT")
+
+# users resolved from access tokens (app.user.cache), dropped on every save
+USER_CACHE_TIMEOUT = 60
+
+# popular posts ranking (app.post.ranking), rebuilt by rebuild_popular_posts
+POPULAR_POSTS_SIZE = 10
+POPULAR_POSTS_KEEP = 100
+POPULAR_POSTS_GRAVITY = 1.8
+POPULAR_POSTS_COMMENT_WEIGHT = 1.0
 
+# journal like/unlike deltas and apply them with flush_like_counts instead of
+# updating like_count on every request
+LIKE_COUNT_WRITE_BEHIND = env("LIKE_COUNT_WRITE_BEHIND")
+LIKE_COUNT_FLUSH_BATCH_SIZE = 1000
 
-# CACHES = {
-#     "default": {
-#         "BACKEND": "django_redis.cache.RedisCache",
-#         "LOCATION": f"redis://{"localhost" if TESTING else "redis"}:6379/1",
-#         "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
-#     }
-# }
+# share of requests metered against the app.core.budgets query budgets
+QUERY_BUDGET_SAMPLE_RATE = max(0, min(1, env("QUERY_BUDGET_SAMPLE_RATE")))
+QUERY_BUDGET_CHECK_TIME = True
+QUERY_BUDGET_RAISE = False
+
+# per-phase view histograms (app.core.instrumentation); read at import time,
+# so turning it off leaves the stock DRF methods in place
+API_PHASE_TIMING = env("API_PHASE_TIMING")
+
+# "wsgi" (gthread workers) or "asgi" (uvicorn workers), see gunicorn.conf.py;
+# under ASGI the hot read views serve GET as coroutines on the async ORM
+# (app.core.async_views). Read when the URLconf is loaded.
+SERVER_MODE = env("SERVER_MODE")
+ASYNC_VIEWS = SERVER_MODE == "asgi"
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -232,6 +314,14 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Bloom filter over blacklisted refresh tokens (app.core.security.blacklist);
+# past capacity its false positive rate, and so the queries, go up
+TOKEN_BLACKLIST_FILTER_CAPACITY = 100_000
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = 0.001
+# how far before a rebuild started it re-adds tokens blacklisted meanwhile;
+# covers clock skew between hosts and slow logout transactions
+TOKEN_BLACKLIST_FILTER_REPLAY_MARGIN = 300
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Rashisky BlogPost APIs",
     "DESCRIPTION": "API for Post, Comments",
@@ -287,39 +377,68 @@ LOGGING = {
     "root": {"handlers": ["console"], "level": "INFO"},
 }
 
+# production log files are written by a background listener per worker
+# (app.core.log_pipeline): bounded queue, drop-and-count when full, batched
+# writes, rotation by size or, with LOG_ROTATE_WHEN (e.g. "midnight"), time,
+# done by whichever worker gets there first under a lock file
+LOG_QUEUE_SIZE = 10_000
+LOG_QUEUE_BATCH_SIZE = 100
+LOG_ROTATE_WHEN = env("LOG_ROTATE_WHEN")
+LOG_ROTATE_MAX_BYTES = 50 * 1024 * 1024
+LOG_ROTATE_BACKUP_COUNT = 7
+
+
+def log_file_handler(filename, level, **extra):
+    if LOG_ROTATE_WHEN:
+        rotation = {
+            "class": "app.core.log_pipeline.BatchTimedRotatingFileHandler",
+            "when": LOG_ROTATE_WHEN,
+        }
+    else:
+        rotation = {
+            "class": "app.core.log_pipeline.BatchRotatingFileHandler",
+            "maxBytes": LOG_ROTATE_MAX_BYTES,
+        }
+    return {
+        **rotation,
+        "formatter": "json",
+        "filename": LOG_DIR / filename,
+        "level": level,
+        "backupCount": LOG_ROTATE_BACKUP_COUNT,
+        **extra,
+    }
+
+
+def log_queue_handler(*handlers):
+    return {
+        "class": "app.core.log_pipeline.DroppingQueueHandler",
+        "queue": {"()": "queue.Queue", "maxsize": LOG_QUEUE_SIZE},
+        "listener": {
+            "()": "app.core.log_pipeline.batching_listener",
+            "batch_size": LOG_QUEUE_BATCH_SIZE,
+        },
+        "handlers": list(handlers),
+        "respect_handler_level": True,
+    }
+
+
 if not (DEBUG or TESTING):
     LOGGING["handlers"] = {
         "console": {"class": "logging.StreamHandler", "formatter": "standard"},
-        "app_handler": {
-            "class": "logging.FileHandler",
-            "formatter": "json",
-            "filename": LOG_DIR / "api.log",
-            "level": "INFO",
-        },
-        "error_handler": {
-            "class": "logging.FileHandler",
-            "formatter": "json",
-            "filename": LOG_DIR / "error.log",
-            "level": "WARNING",
-        },
-        "django_handler": {
-            "class": "logging.FileHandler",
-            "formatter": "json",
-            "filename": LOG_DIR / "django.log",
-            "level": "ERROR",
-        },
-        "request_handler": {
-            "class": "logging.FileHandler",
-            "formatter": "json",
-            "filename": LOG_DIR / "request.log",
-            "level": "INFO",
-            "filters": ["only_info"],
-        },
+        "app_handler": log_file_handler("api.log", "INFO"),
+        "error_handler": log_file_handler("error.log", "WARNING"),
+        "django_handler": log_file_handler("django.log", "ERROR"),
+        "request_handler": log_file_handler(
+            "request.log", "INFO", filters=["only_info"]
+        ),
+        # one queue per logger, so each record is enqueued once
+        "django_queue": log_queue_handler("django_handler"),
+        "django_request_queue": log_queue_handler("error_handler"),
+        "app_queue": log_queue_handler("app_handler"),
+        "request_queue": log_queue_handler("error_handler", "request_handler"),
     }
 
-    LOGGING["loggers"]["django"]["handlers"].append("django_handler")
-    LOGGING["loggers"]["django.request"]["handlers"].append("error_handler")
-    LOGGING["loggers"]["api"]["handlers"].append("app_handler")
-    LOGGING["loggers"]["request_logger"]["handlers"].extend(
-        ["error_handler", "request_handler"]
-    )
+    LOGGING["loggers"]["django"]["handlers"].append("django_queue")
+    LOGGING["loggers"]["django.request"]["handlers"].append("django_request_queue")
+    LOGGING["loggers"]["api"]["handlers"].append("app_queue")
+    LOGGING["loggers"]["request_logger"]["handlers"].append("request_queue")
@@ -1,10 +1,14 @@
 set -e
 
+# one metrics file per gunicorn worker, aggregated by /metrics/; manage.py
+# commands write there too, so it must exist before the first one runs
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 python manage.py migrate
 
-exec gunicorn blogPost.wsgi:application \
-    --bind 0.0.0.0:8000 \
-    --workers 3 \
+exec gunicorn \
+    --config gunicorn.conf.py \
     --timeout 30 \
     --keep-alive 2 \
     --capture-output \
@@ -0,0 +1,34 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+bind = "0.0.0.0:8000"
+workers = 3
+
+if os.environ.get("SERVER_MODE", "wsgi") == "asgi":
+    # an event loop per worker: the async read views (ASYNC_VIEWS) wait on
+    # the database without holding a thread, sync views run in threads
+    wsgi_app = "blogPost.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "blogPost.wsgi:application"
+    # gthread: password hashing is capped below this (PASSWORD_HASH_WORKERS
+    # and PASSWORD_HASH_QUEUE are derived from it), so a login burst leaves
+    # threads free for the rest of the API
+    threads = int(os.environ.get("WEB_THREADS", 4))
+
+
+def on_starting(server):
+    # samples left by a previous run would be added to the new totals
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # drops the live gauges (requests in progress) of the dead worker;
+    # its counters and histograms stay in the aggregate
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)